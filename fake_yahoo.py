@@ -0,0 +1,353 @@
+import argparse
+import collections
+import datetime
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Table markup variants, one per selector the scraper tries (see
+# table_selectors in scraper.py), plus a bare table for the generic fallback
+TABLE_LAYOUTS = {
+    "data-test": '<table data-test="historical-prices">{rows}</table>',
+    "class": '<table class="historical-prices W(100%)">{rows}</table>',
+    "div-id": '<div id="quote-history"><table>{rows}</table></div>',
+    "div-class": '<div class="history-table"><table>{rows}</table></div>',
+    "bare": "<section><table>{rows}</table></section>",
+}
+
+# Cookie dialog variants, matching the scraper's cookie_selectors
+COOKIE_LAYOUTS = {
+    "accept-all": "<button onclick=\"dismiss()\">Accept all</button>",
+    "agree": "<button onclick=\"dismiss()\">Agree</button>",
+    "consent-id": '<button id="consent-page-ok" onclick="dismiss()">OK</button>',
+    "accept-class": '<button class="btn accept-all" onclick="dismiss()">Continue</button>',
+    "none": None,
+}
+
+LOGIN_PAGE = """<html><head><title>Yahoo Login</title></head><body>
+<form action="/account/challenge/password" method="get">
+<input type="text" name="username" placeholder="Username, email, or mobile">
+<input type="submit" name="signin" value="Next">
+</form>
+</body></html>"""
+
+PASSWORD_PAGE = """<html><head><title>Yahoo Login</title></head><body>
+<form action="/account/done" method="get">
+<input type="password" name="password">
+{button}
+</form>
+</body></html>"""
+
+SIGN_IN_BUTTONS = [
+    '<button type="submit" name="verifyPassword">Sign in</button>',
+    '<button type="submit" id="login-signin">Sign in</button>',
+    '<button type="submit">Sign in</button>',
+]
+
+HISTORY_PAGE = """<html><head><title>{ticker} Historical Data</title>
+<script>function dismiss() {{ document.getElementById('consent').remove(); }}</script>
+</head><body>
+{cookie}
+<h1>{ticker} Historical Data</h1>
+{table}
+</body></html>"""
+
+COOKIE_DIALOG = '<div id="consent" role="dialog"><p>We use cookies.</p>{button}</div>'
+
+HISTORY_HEADER = (
+    "<thead><tr><th>Date</th><th>Open</th><th>High</th><th>Low</th>"
+    "<th>Close Close price adjusted for splits.</th>"
+    "<th>Adj Close Adjusted close price adjusted for splits and dividend and/or capital gain distributions.</th>"
+    "<th>Volume</th></tr></thead>"
+)
+
+ERROR_PAGE = "<html><body><h1>{status}</h1><p>{message}</p></body></html>"
+
+# Every price walk starts here, so a (ticker, date) bar does not depend on the
+# requested range; there is no data before this day
+WALK_EPOCH = datetime.date(2000, 1, 3)
+
+
+class FakeYahooConfig:
+    """
+    Behaviour knobs of the fake Yahoo server
+
+    latency (float): Seconds added to every response
+    jitter (float): Extra random delay of up to this many seconds
+    error_rate (float): Probability of answering a history page with a 500
+    rate_limit (int): History requests per minute before answering 429, 0 disables
+    table_layout (str): Key of TABLE_LAYOUTS, or "random" per request
+    cookie_layout (str): Key of COOKIE_LAYOUTS, or "random" per request
+    dividend_every (int): Add a dividend row every N trading days, 0 disables
+    seed (int, optional): Seed for the error/layout choices
+    """
+
+    def __init__(
+        self,
+        latency=0.0,
+        jitter=0.0,
+        error_rate=0.0,
+        rate_limit=0,
+        table_layout="random",
+        cookie_layout="random",
+        dividend_every=63,
+        seed=None,
+    ):
+        if table_layout != "random" and table_layout not in TABLE_LAYOUTS:
+            raise ValueError(f"Unknown table layout: {table_layout}")
+        if cookie_layout != "random" and cookie_layout not in COOKIE_LAYOUTS:
+            raise ValueError(f"Unknown cookie layout: {cookie_layout}")
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.table_layout = table_layout
+        self.cookie_layout = cookie_layout
+        self.dividend_every = dividend_every
+        self.seed = seed
+
+
+def history_rows(ticker_symbol, period1, period2, dividend_every=63):
+    """
+    Deterministic daily bars for a ticker, newest first like Yahoo
+
+    The walk always starts at WALK_EPOCH and is sliced to the requested range,
+    so windowed and full-period requests agree on every day they share.
+
+    Parameters:
+    ticker_symbol (str): The stock ticker symbol
+    period1, period2 (int): Unix timestamps bounding the range
+    dividend_every (int): Add a dividend row every N trading days, 0 disables
+
+    Returns:
+    list: (date, open, high, low, close, adj_close, volume) tuples; dividend
+        rows are (date, "0.24 Dividend")
+    """
+    rng = random.Random(zlib.crc32(ticker_symbol.encode("utf-8")))
+    price = rng.uniform(20, 500)
+    first = datetime.datetime.fromtimestamp(period1, datetime.timezone.utc).date()
+    last = datetime.datetime.fromtimestamp(period2, datetime.timezone.utc).date()
+    day = WALK_EPOCH
+
+    rows = []
+    trading_day = 0
+    while day < last:
+        if day.weekday() < 5:
+            open_price = price
+            close = max(1.0, price * (1 + rng.gauss(0, 0.015)))
+            high = max(open_price, close) * (1 + abs(rng.gauss(0, 0.005)))
+            low = min(open_price, close) * (1 - abs(rng.gauss(0, 0.005)))
+            volume = rng.randint(1_000_000, 90_000_000)
+            trading_day += 1
+            if day >= first:
+                rows.append((day, open_price, high, low, close, close * 0.99, volume))
+                if dividend_every and trading_day % dividend_every == 0:
+                    rows.append((day, "0.24 Dividend"))
+            price = close
+        day += datetime.timedelta(days=1)
+    return rows[::-1]
+
+
+def render_rows(rows):
+    html = [HISTORY_HEADER, "<tbody>"]
+    for row in rows:
+        date = f"{row[0]:%b} {row[0].day}, {row[0].year}"
+        if len(row) == 2:
+            html.append(f'<tr><td>{date}</td><td colspan="6">{row[1]}</td></tr>')
+            continue
+        cells = [f"{value:,.2f}" for value in row[1:6]] + [f"{row[6]:,}"]
+        html.append(
+            "<tr><td>" + date + "</td>" + "".join(f"<td>{c}</td>" for c in cells) + "</tr>"
+        )
+    html.append("</tbody>")
+    return "".join(html)
+
+
+class FakeYahooServer(ThreadingHTTPServer):
+    """
+    Local stand-in for login.yahoo.com and finance.yahoo.com/quote/*/history
+
+    Point the scraper at it with YAHOO_LOGIN_URL=<url>/ and
+    YAHOO_FINANCE_URL=<url>.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        self.config = config or FakeYahooConfig()
+        self.rng = random.Random(self.config.seed)
+        self.lock = threading.Lock()
+        self.history_requests = collections.deque()
+        self.status_counts = collections.Counter()
+        super().__init__((host, port), FakeYahooRequestHandler)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def choose(self, setting, options):
+        with self.lock:
+            if setting == "random":
+                return self.rng.choice(sorted(options))
+            return setting
+
+    def roll(self, probability):
+        with self.lock:
+            return self.rng.random() < probability
+
+    def throttled(self):
+        if not self.config.rate_limit:
+            return False
+        now = time.monotonic()
+        with self.lock:
+            while self.history_requests and now - self.history_requests[0] > 60:
+                self.history_requests.popleft()
+            if len(self.history_requests) >= self.config.rate_limit:
+                return True
+            self.history_requests.append(now)
+            return False
+
+    def count(self, status):
+        with self.lock:
+            self.status_counts[status] += 1
+
+    def stats(self):
+        with self.lock:
+            return dict(self.status_counts)
+
+
+class FakeYahooRequestHandler(BaseHTTPRequestHandler):
+    HISTORY_PATH = re.compile(r"^/quote/([^/]+)/history/?$")
+
+    def do_GET(self):
+        config = self.server.config
+        delay = config.latency
+        if config.jitter:
+            with self.server.lock:
+                delay += self.server.rng.uniform(0, config.jitter)
+        if delay:
+            time.sleep(delay)
+
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if url.path == "/":
+            self.send_html(200, LOGIN_PAGE)
+        elif url.path == "/account/challenge/password":
+            button = SIGN_IN_BUTTONS[self.server.choose("random", range(3))]
+            self.send_html(200, PASSWORD_PAGE.format(button=button))
+        elif url.path == "/account/done":
+            self.send_html(200, "<html><body><h1>Signed in</h1></body></html>")
+        elif self.HISTORY_PATH.match(url.path):
+            self.send_history(self.HISTORY_PATH.match(url.path).group(1), params)
+        else:
+            self.send_html(404, ERROR_PAGE.format(status=404, message="Not found"))
+
+    def send_history(self, ticker_symbol, params):
+        if self.server.throttled():
+            self.send_html(429, ERROR_PAGE.format(status=429, message="Too Many Requests"))
+            return
+        if self.server.roll(self.server.config.error_rate):
+            self.send_html(500, ERROR_PAGE.format(status=500, message="Internal Server Error"))
+            return
+
+        now = int(time.time())
+        try:
+            period1 = int(params.get("period1", now - 86400 * 365))
+            period2 = int(params.get("period2", now))
+        except ValueError:
+            self.send_html(400, ERROR_PAGE.format(status=400, message="Bad period"))
+            return
+
+        rows = history_rows(
+            ticker_symbol, period1, period2, self.server.config.dividend_every
+        )
+        table_layout = self.server.choose(self.server.config.table_layout, TABLE_LAYOUTS)
+        cookie_layout = self.server.choose(self.server.config.cookie_layout, COOKIE_LAYOUTS)
+        cookie_button = COOKIE_LAYOUTS[cookie_layout]
+        page = HISTORY_PAGE.format(
+            ticker=ticker_symbol,
+            cookie=COOKIE_DIALOG.format(button=cookie_button) if cookie_button else "",
+            table=TABLE_LAYOUTS[table_layout].format(rows=render_rows(rows)),
+        )
+        self.send_html(200, page)
+
+    def send_html(self, status, html):
+        self.server.count(status)
+        payload = html.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def add_config_arguments(parser):
+    """
+    Add the FakeYahooConfig options to an argument parser
+    """
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay of up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a 500 on history pages")
+    parser.add_argument("--rate-limit", type=int, default=0, help="History requests per minute before 429s (0 = unlimited)")
+    parser.add_argument(
+        "--table-layout",
+        default="random",
+        choices=["random"] + sorted(TABLE_LAYOUTS),
+        help="History table markup variant",
+    )
+    parser.add_argument(
+        "--cookie-layout",
+        default="random",
+        choices=["random"] + sorted(COOKIE_LAYOUTS),
+        help="Cookie dialog variant",
+    )
+    parser.add_argument("--seed", type=int, help="Seed for error and layout choices")
+
+
+def config_from_args(args):
+    return FakeYahooConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        table_layout=args.table_layout,
+        cookie_layout=args.cookie_layout,
+        seed=args.seed,
+    )
+
+
+def main():
+    """
+    Run the fake Yahoo server in the foreground
+    """
+    parser = argparse.ArgumentParser(
+        description="Serve fake Yahoo login and history pages for local testing."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server = FakeYahooServer(config_from_args(args), args.host, args.port)
+    print(f"Fake Yahoo listening on {server.url}")
+    print(f"Run the scraper with: YAHOO_LOGIN_URL={server.url}/ YAHOO_FINANCE_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Responses by status: {server.stats()}")
+
+
+if __name__ == "__main__":
+    main()
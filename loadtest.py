@@ -0,0 +1,266 @@
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import fake_yahoo
+import store
+
+SCRAPER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scraper.py")
+
+
+def split_tickers(tickers, workers):
+    """
+    Deal tickers round-robin into one list per worker
+
+    Parameters:
+    tickers (list): Ticker symbols
+    workers (int): Number of workers
+
+    Returns:
+    list: Non-empty ticker lists, at most `workers` of them
+    """
+    chunks = [tickers[i::workers] for i in range(workers)]
+    return [chunk for chunk in chunks if chunk]
+
+
+def process_tree_rss(root_pids):
+    """
+    Sum the resident memory of processes and all their descendants
+
+    Reads /proc, so this only works on Linux.
+
+    Parameters:
+    root_pids (list): Process IDs whose trees are measured
+
+    Returns:
+    int: Resident set size in bytes, or None when /proc is unavailable
+    """
+    if not os.path.isdir("/proc"):
+        return None
+    children = {}
+    rss_pages = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat_file:
+                stat = stat_file.read()
+        except OSError:
+            continue  # Exited while we were scanning
+        # The command name may contain spaces, so split after its closing ")"
+        fields = stat.rsplit(")", 1)[1].split()
+        pid = int(entry)
+        children.setdefault(int(fields[1]), []).append(pid)
+        rss_pages[pid] = int(fields[21])
+
+    total_pages = 0
+    pending = list(root_pids)
+    seen = set()
+    while pending:
+        pid = pending.pop()
+        if pid in seen:
+            continue
+        seen.add(pid)
+        total_pages += rss_pages.get(pid, 0)
+        pending.extend(children.get(pid, []))
+    return total_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+class RssSampler(threading.Thread):
+    """
+    Track the peak combined memory of a set of process trees in the background
+
+    Each sample sums every worker with its browser and driver processes, so the
+    peak is what the whole run needed at once on this machine.
+    """
+
+    def __init__(self, pids, interval=0.2):
+        super().__init__(daemon=True)
+        self.pids = list(pids)
+        self.interval = interval
+        self.peak_bytes = 0
+        self.available = True
+        self.stopped = threading.Event()
+
+    def sample(self):
+        rss = process_tree_rss(self.pids)
+        if rss is None:
+            self.available = False
+        else:
+            self.peak_bytes = max(self.peak_bytes, rss)
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.sample()
+            self.stopped.wait(self.interval)
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+    @property
+    def peak_mb(self):
+        return self.peak_bytes / (1024 * 1024) if self.available else None
+
+
+def run_load_test(tickers, workers, server_url, script=SCRAPER_SCRIPT, log_dir=None):
+    """
+    Run the scraper end-to-end against a (fake) Yahoo server
+
+    The tickers are split over `workers` scraper processes running in
+    parallel, each running main() in its own working directory. Memory is
+    sampled across all worker process trees during this run only, and
+    peak_rss_mb is the highest combined resident size seen (None off Linux).
+
+    Parameters:
+    tickers (list): Ticker symbols to scrape
+    workers (int): Number of parallel scraper processes
+    server_url (str): Base URL of the server, e.g. FakeYahooServer.url
+    script (str): Scraper entry point (default: scraper.py next to this file)
+    log_dir (str, optional): Keep each worker's output in this directory
+
+    Returns:
+    dict: workers, tickers, successful (tickers whose file has data rows),
+        failed, elapsed_seconds, tickers_per_minute, failure_rate,
+        cpu_seconds, peak_rss_mb
+    """
+    env = dict(os.environ)
+    env["YAHOO_LOGIN_URL"] = f"{server_url}/"
+    env["YAHOO_FINANCE_URL"] = server_url
+    env.setdefault("YAHOO_EMAIL", "loadtest@example.com")
+    env.setdefault("YAHOO_PASSWORD", "loadtest")
+
+    chunks = split_tickers(tickers, workers)
+    usage_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    with tempfile.TemporaryDirectory(prefix="yahoo_loadtest_") as work_root:
+        processes = []
+        start_time = time.perf_counter()
+        for i, chunk in enumerate(chunks):
+            work_dir = os.path.join(work_root, f"worker_{i}")
+            os.makedirs(work_dir)
+            log_path = os.path.join(log_dir or work_dir, f"{workers}_workers_{i}.log")
+            log_file = open(log_path, "w")
+            process = subprocess.Popen(
+                [sys.executable, script, "--tickers"] + chunk,
+                cwd=work_dir,
+                env=env,
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+            )
+            processes.append((process, log_file, work_dir))
+
+        sampler = RssSampler([process.pid for process, _, _ in processes])
+        sampler.start()
+        for process, log_file, _ in processes:
+            process.wait()
+            log_file.close()
+        elapsed = time.perf_counter() - start_time
+        sampler.stop()
+
+        # A ticker only counts once its file holds at least one data row;
+        # load_daily_bars skips the header-only files of empty scrapes
+        successful = set()
+        for _, _, work_dir in processes:
+            daily = store.load_daily_bars(os.path.join(work_dir, "stock_data"))
+            successful.update(daily["Ticker"])
+
+    usage_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu_seconds = (usage_after.ru_utime - usage_before.ru_utime) + (
+        usage_after.ru_stime - usage_before.ru_stime
+    )
+    succeeded = len(successful & set(tickers))
+    return {
+        "workers": workers,
+        "tickers": len(tickers),
+        "successful": succeeded,
+        "failed": len(tickers) - succeeded,
+        "elapsed_seconds": elapsed,
+        "tickers_per_minute": succeeded / elapsed * 60 if elapsed else 0.0,
+        "failure_rate": (len(tickers) - succeeded) / len(tickers) if tickers else 0.0,
+        "cpu_seconds": cpu_seconds,
+        "peak_rss_mb": sampler.peak_mb,
+    }
+
+
+def print_report(results):
+    print("\n" + "=" * 78)
+    print("LOAD TEST RESULTS")
+    print("=" * 78)
+    print(
+        f"{'workers':>7} {'tickers':>7} {'ok':>5} {'failed':>6} {'elapsed s':>10} "
+        f"{'tickers/min':>11} {'fail %':>7} {'cpu s':>8} {'peak MB':>8}"
+    )
+    for r in results:
+        peak_mb = "n/a" if r["peak_rss_mb"] is None else f"{r['peak_rss_mb']:.1f}"
+        print(
+            f"{r['workers']:>7} {r['tickers']:>7} {r['successful']:>5} {r['failed']:>6} "
+            f"{r['elapsed_seconds']:>10.1f} {r['tickers_per_minute']:>11.2f} "
+            f"{r['failure_rate'] * 100:>7.1f} {r['cpu_seconds']:>8.1f} {peak_mb:>8}"
+        )
+    print("=" * 78)
+
+
+def main():
+    """
+    Load-test the scraper at several worker counts against a fake Yahoo server
+    """
+    parser = argparse.ArgumentParser(
+        description="Measure scraper throughput and robustness without hitting the live site."
+    )
+    parser.add_argument(
+        "--tickers",
+        nargs="+",
+        default=["AAPL", "MSFT", "GOOGL", "AMZN", "META", "TSLA", "NVDA", "JPM", "V", "WMT"],
+        help="Tickers to scrape in each run",
+    )
+    parser.add_argument(
+        "--workers",
+        nargs="+",
+        type=int,
+        default=[1, 2, 4],
+        help="Worker counts to test (e.g., 1 2 4 8)",
+    )
+    parser.add_argument(
+        "--server-url",
+        help="Use an already running fake server instead of starting one",
+    )
+    parser.add_argument("--log-dir", help="Keep each worker's scraper output here")
+    fake_yahoo.add_config_arguments(parser)
+    args = parser.parse_args()
+
+    if args.log_dir:
+        os.makedirs(args.log_dir, exist_ok=True)
+
+    server = None
+    server_url = args.server_url
+    if server_url is None:
+        server = fake_yahoo.FakeYahooServer(fake_yahoo.config_from_args(args))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        server_url = server.url
+    print(f"Using fake Yahoo server at {server_url}")
+
+    results = []
+    try:
+        for workers in args.workers:
+            print(f"\nRunning {len(args.tickers)} tickers with {workers} worker(s)...")
+            results.append(
+                run_load_test(args.tickers, workers, server_url, log_dir=args.log_dir)
+            )
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    print_report(results)
+    if server is not None:
+        print(f"Fake server responses by status: {server.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import cProfile
+import io
+import os
+import pstats
+import tracemalloc
+
+PROFILE_MODES = ["cpu", "mem"]
+
+# Leave the profiler's own bookkeeping out of allocation reports
+TRACE_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+class RunProfiler:
+    """
+    Profile each scrape of a run with cProfile or tracemalloc
+
+    In "cpu" mode every call writes "<label>.pstats" and "<label>_cpu.txt";
+    finish() merges them into "run.pstats" / "run_cpu.txt". In "mem" mode
+    every call writes "<label>_mem.txt" with the allocations made during the
+    call and its peak memory; finish() writes "run_mem.txt" with the top
+    allocations still held at the end of the run and the per-call peaks.
+    """
+
+    def __init__(self, mode, output_dir, top=25):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        self.mode = mode
+        self.output_dir = output_dir
+        self.top = top
+        self.stats_files = []
+        self.peaks = []
+        os.makedirs(output_dir, exist_ok=True)
+        if mode == "mem":
+            tracemalloc.start(10)
+
+    def profile(self, label, func, *args, **kwargs):
+        """
+        Call func(*args, **kwargs) under the profiler
+
+        Parameters:
+        label (str): Name of the per-call report files, e.g. the ticker
+        func (callable): Function to profile
+
+        Returns:
+        The return value of func
+        """
+        if self.mode == "cpu":
+            return self._profile_cpu(label, func, *args, **kwargs)
+        return self._profile_mem(label, func, *args, **kwargs)
+
+    def _profile_cpu(self, label, func, *args, **kwargs):
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func, *args, **kwargs)
+        finally:
+            stats_file = os.path.join(self.output_dir, f"{label}.pstats")
+            profiler.dump_stats(stats_file)
+            self.stats_files.append(stats_file)
+            self._write_cpu_report(
+                os.path.join(self.output_dir, f"{label}_cpu.txt"), pstats.Stats(profiler)
+            )
+
+    def _profile_mem(self, label, func, *args, **kwargs):
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot().filter_traces(TRACE_FILTERS)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            after = tracemalloc.take_snapshot().filter_traces(TRACE_FILTERS)
+            current, peak = tracemalloc.get_traced_memory()
+            self.peaks.append((label, peak))
+            lines = [
+                f"Memory profile for {label}",
+                f"Traced memory after call: {current / 1024 / 1024:.1f} MiB",
+                f"Peak traced memory during call: {peak / 1024 / 1024:.1f} MiB",
+                "",
+                f"Top {self.top} allocation changes during call:",
+            ]
+            for stat in after.compare_to(before, "lineno")[: self.top]:
+                lines.append(str(stat))
+            self._write_lines(os.path.join(self.output_dir, f"{label}_mem.txt"), lines)
+
+    def finish(self):
+        """
+        Write the merged run reports and stop tracing
+
+        Returns:
+        str: Path of the merged report
+        """
+        if self.mode == "cpu":
+            merged_file = os.path.join(self.output_dir, "run.pstats")
+            if self.stats_files:
+                merged = pstats.Stats(*self.stats_files)
+                merged.dump_stats(merged_file)
+                self._write_cpu_report(os.path.join(self.output_dir, "run_cpu.txt"), merged)
+            return merged_file
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(TRACE_FILTERS)
+        tracemalloc.stop()
+        lines = ["Peak traced memory per call:"]
+        for label, peak in sorted(self.peaks, key=lambda item: item[1], reverse=True):
+            lines.append(f"  {label}: {peak / 1024 / 1024:.1f} MiB")
+        lines += ["", f"Top {self.top} allocations held at end of run:"]
+        for stat in snapshot.statistics("lineno")[: self.top]:
+            lines.append(str(stat))
+        report_file = os.path.join(self.output_dir, "run_mem.txt")
+        self._write_lines(report_file, lines)
+        return report_file
+
+    def _write_cpu_report(self, path, stats):
+        buffer = io.StringIO()
+        stats.stream = buffer
+        stats.sort_stats("cumulative").print_stats(self.top)
+        with open(path, "w") as report:
+            report.write(buffer.getvalue())
+
+    def _write_lines(self, path, lines):
+        with open(path, "w") as report:
+            report.write("\n".join(lines) + "\n")
@@ -0,0 +1,265 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar,
+    GoodFriday,
+    Holiday,
+    USLaborDay,
+    USMartinLutherKingJr,
+    USMemorialDay,
+    USPresidentsDay,
+    USThanksgivingDay,
+    nearest_workday,
+    sunday_to_monday,
+)
+from pandas.tseries.offsets import CustomBusinessDay
+
+import store
+
+
+class USTradingCalendar(AbstractHolidayCalendar):
+    """
+    Full-day US stock exchange holidays
+
+    Only the regular yearly holidays are listed. One-off closures (national
+    days of mourning, weather or other emergencies) are not, so those days
+    show up as missing days that no re-scrape can ever fill.
+    """
+
+    rules = [
+        # A Saturday New Year's Day is not observed on the Friday before:
+        # the exchange stays open on Dec 31
+        Holiday("NewYearsDay", month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday(
+            "Juneteenth",
+            month=6,
+            day=19,
+            start_date="2022-01-01",
+            observance=nearest_workday,
+        ),
+        Holiday("IndependenceDay", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas", month=12, day=25, observance=nearest_workday),
+    ]
+
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Adj_Close"]
+GAP_COLUMNS = ["Ticker", "Start", "End", "Days", "Issues"]
+
+
+def trading_sessions(start, end, calendar=None):
+    """
+    Expected trading days between two dates (inclusive)
+
+    Parameters:
+    start, end: Anything pandas can convert to a Timestamp
+    calendar (AbstractHolidayCalendar, optional): Holidays to skip
+        (default: USTradingCalendar)
+
+    Returns:
+    pandas.DatetimeIndex: The trading days
+    """
+    if calendar is None:
+        calendar = USTradingCalendar()
+    return pd.date_range(start, end, freq=CustomBusinessDay(calendar=calendar))
+
+
+def check_rows(daily):
+    """
+    Flag bad rows of many tickers in one vectorized pass
+
+    Checks for OHLC inconsistencies (Low <= Open/Close <= High), negative
+    volume, rows with prices left NaN by errors="coerce" and rows whose Date
+    could not be parsed. Dividend and split rows (no prices, but another
+    complete row on the same day) are not flagged.
+
+    Parameters:
+    daily (pandas.DataFrame): Long frame as returned by store.load_daily_bars()
+
+    Returns:
+    pandas.DataFrame: Ticker, Date, Issue - one row per problem found
+    """
+    daily = daily.reset_index(drop=True)
+    price = daily.reindex(columns=["Open", "High", "Low", "Close"])
+    volume = daily.reindex(columns=["Volume"])["Volume"]
+
+    low, high = price["Low"], price["High"]
+    inconsistent = (
+        (low > high)
+        | (price["Open"] < low)
+        | (price["Open"] > high)
+        | (price["Close"] < low)
+        | (price["Close"] > high)
+    )
+    negative_volume = volume < 0
+
+    price_cols = [col for col in PRICE_COLUMNS if col in daily.columns]
+    incomplete = daily[price_cols].isna().any(axis=1) | volume.isna()
+    complete_days = pd.MultiIndex.from_frame(daily.loc[~incomplete, ["Ticker", "Date"]])
+    has_complete_row = pd.MultiIndex.from_frame(daily[["Ticker", "Date"]]).isin(
+        complete_days
+    )
+    nan_values = incomplete & ~has_complete_row & daily["Date"].notna()
+
+    checks = {
+        "ohlc_inconsistent": inconsistent,
+        "negative_volume": negative_volume,
+        "nan_values": nan_values,
+        "unparsed_date": daily["Date"].isna(),
+    }
+    issues = [
+        daily.loc[mask.to_numpy(), ["Ticker", "Date"]].assign(Issue=name)
+        for name, mask in checks.items()
+    ]
+    return pd.concat(issues, ignore_index=True)
+
+
+def missing_days(daily, start=None, end=None, calendar=None):
+    """
+    Find expected trading days with no row, for all tickers at once
+
+    Parameters:
+    daily (pandas.DataFrame): Long frame as returned by store.load_daily_bars()
+    start, end (optional): Window every ticker should cover; by default each
+        ticker is checked between its own first and last date
+    calendar (AbstractHolidayCalendar, optional): See trading_sessions()
+
+    Returns:
+    pandas.DataFrame: Ticker, Date, Issue ("missing_day") per missing day
+    """
+    dated = daily.dropna(subset=["Date"])
+    if dated.empty:
+        return pd.DataFrame(columns=["Ticker", "Date", "Issue"])
+
+    bounds = dated.groupby("Ticker")["Date"].agg(["min", "max"])
+    if start is not None:
+        bounds["min"] = pd.Timestamp(start)
+    if end is not None:
+        bounds["max"] = pd.Timestamp(end)
+
+    sessions = trading_sessions(bounds["min"].min(), bounds["max"].max(), calendar)
+    expected = pd.MultiIndex.from_product(
+        [bounds.index, sessions], names=["Ticker", "Date"]
+    ).to_frame(index=False)
+    expected = expected.join(bounds, on="Ticker")
+    expected = expected[
+        (expected["Date"] >= expected["min"]) & (expected["Date"] <= expected["max"])
+    ]
+
+    present = pd.MultiIndex.from_frame(dated[["Ticker", "Date"]])
+    missing = ~pd.MultiIndex.from_frame(expected[["Ticker", "Date"]]).isin(present)
+    return expected.loc[missing, ["Ticker", "Date"]].assign(Issue="missing_day")
+
+
+def build_gap_index(issues, calendar=None):
+    """
+    Collapse per-day issues into (ticker, date-range) holes to re-fetch
+
+    Consecutive trading days with issues for the same ticker are merged into
+    a single range. Issues without a parsed Date cannot be located and are
+    left out.
+
+    Parameters:
+    issues (pandas.DataFrame): Ticker, Date, Issue rows from check_rows()
+        and/or missing_days()
+    calendar (AbstractHolidayCalendar, optional): See trading_sessions()
+
+    Returns:
+    pandas.DataFrame: Ticker, Start, End, Days, Issues (comma-separated kinds)
+    """
+    located = issues.dropna(subset=["Date"])
+    if located.empty:
+        return pd.DataFrame(columns=GAP_COLUMNS)
+
+    days = located[["Ticker", "Date"]].drop_duplicates().sort_values(["Ticker", "Date"])
+    sessions = trading_sessions(days["Date"].min(), days["Date"].max(), calendar)
+    # Position in the trading calendar; off-calendar dates share the next slot
+    position = sessions.searchsorted(days["Date"])
+    new_run = (days["Ticker"] != days["Ticker"].shift()) | (
+        np.diff(position, prepend=-2) != 1
+    )
+    days["Run"] = new_run.cumsum()
+
+    located = located.merge(days, on=["Ticker", "Date"])
+    gaps = located.groupby("Run").agg(
+        Ticker=("Ticker", "first"),
+        Start=("Date", "min"),
+        End=("Date", "max"),
+        Days=("Date", "nunique"),
+        Issues=("Issue", lambda kinds: ",".join(sorted(kinds.unique()))),
+    )
+    return gaps.reset_index(drop=True)[GAP_COLUMNS]
+
+
+def read_gap_index(path):
+    """
+    Read a gap index CSV written by this module
+
+    Parameters:
+    path (str): The file path
+
+    Returns:
+    pandas.DataFrame: Gap index with Start/End parsed as datetime
+    """
+    return pd.read_csv(path, parse_dates=["Start", "End"])
+
+
+def validate_directory(data_dir, period="1y", start=None, end=None):
+    """
+    Run all checks over the stored data of every ticker
+
+    Parameters:
+    data_dir (str): Directory holding the scraper output
+    period (str): Period label used in the filenames (default: "1y")
+    start, end (optional): Window every ticker should cover, see missing_days()
+
+    Returns:
+    tuple: (issues, gap_index) DataFrames
+    """
+    daily = store.load_daily_bars(data_dir, period)
+    issues = pd.concat(
+        [check_rows(daily), missing_days(daily, start, end)], ignore_index=True
+    )
+    return issues, build_gap_index(issues)
+
+
+def main():
+    """
+    Validate stored data and write a gap index for targeted re-scrapes
+    """
+    parser = argparse.ArgumentParser(
+        description="Check scraped stock data and write a gap index of holes to re-fetch."
+    )
+    parser.add_argument(
+        "--data-dir", default="stock_data", help="Directory with scraped CSV files"
+    )
+    parser.add_argument("--period", default="1y", help="Period label of the files")
+    parser.add_argument("--start", help="First date every ticker should have (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Last date every ticker should have (YYYY-MM-DD)")
+    parser.add_argument(
+        "--output",
+        help="Where to write the gap index (default: <data-dir>/gap_index.csv)",
+    )
+    args = parser.parse_args()
+
+    issues, gaps = validate_directory(args.data_dir, args.period, args.start, args.end)
+    output = args.output or os.path.join(args.data_dir, "gap_index.csv")
+    gaps.to_csv(output, index=False, date_format="%Y-%m-%d")
+
+    print(f"Issues found: {len(issues)}")
+    for issue, count in issues["Issue"].value_counts().items():
+        print(f"  {issue}: {count}")
+    print(f"Gap index with {len(gaps)} ranges written to: {os.path.abspath(output)}")
+    print(f"Re-fetch them with: python scraper.py --gap-index {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+import argparse
+import collections
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+import store
+
+
+class FrameCache:
+    """
+    Size-bounded LRU cache of parsed ticker frames
+
+    An entry is reused only while the file's (inode, mtime, size) is
+    unchanged. Since the scraper replaces files atomically, a rewrite always
+    shows up as a new signature and the next read re-parses the file.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = collections.OrderedDict()  # path -> (signature, frame, nbytes)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, path):
+        """
+        Return the parsed frame for a ticker file, loading it if needed
+
+        Parameters:
+        path (str): The ticker file path
+
+        Returns:
+        pandas.DataFrame: Rows sorted by Date, rows without a Date left out.
+            Treat it as read-only, it is shared between callers.
+        """
+        stat = os.stat(path)
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is not None and entry[0] == signature:
+                self.entries.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        frame = store.read_ticker_frame(path)
+        if "Date" in frame.columns:
+            frame = frame.dropna(subset=["Date"]).sort_values("Date", kind="stable")
+            frame = frame.reset_index(drop=True)
+        nbytes = int(frame.memory_usage(deep=True).sum())
+
+        with self.lock:
+            self._discard(path)
+            if nbytes <= self.max_bytes:
+                self.entries[path] = (signature, frame, nbytes)
+                self.total_bytes += nbytes
+                while self.total_bytes > self.max_bytes:
+                    self._discard(next(iter(self.entries)))
+        return frame
+
+    def _discard(self, path):
+        entry = self.entries.pop(path, None)
+        if entry is not None:
+            self.total_bytes -= entry[2]
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class QueryService:
+    """
+    Read-only queries over the scraper's output directory
+    """
+
+    def __init__(self, data_dir="stock_data", period="1y", max_bytes=256 * 1024 * 1024):
+        self.data_dir = data_dir
+        self.period = period
+        self.cache = FrameCache(max_bytes)
+
+    def tickers(self):
+        """
+        Tickers with stored data
+
+        Returns:
+        list: Ticker symbols, sorted
+        """
+        return list(store.list_ticker_files(self.data_dir, self.period))
+
+    def get(self, ticker_symbol, start=None, end=None, columns=None):
+        """
+        Rows of one ticker, optionally limited to a date range and columns
+
+        Parameters:
+        ticker_symbol (str): The stock ticker symbol
+        start, end (optional): Inclusive date bounds
+        columns (list, optional): Columns to return besides Date
+
+        Returns:
+        pandas.DataFrame: The matching rows, sorted by Date
+        """
+        # Tickers come straight from HTTP query strings; a path separator
+        # would let them name files outside data_dir
+        if "/" in ticker_symbol or "\\" in ticker_symbol:
+            raise KeyError(f"No data stored for {ticker_symbol}")
+        path = store.ticker_file_path(self.data_dir, ticker_symbol, self.period)
+        if not os.path.exists(path):
+            raise KeyError(f"No data stored for {ticker_symbol}")
+        frame = self.cache.get(path)
+
+        # Frames are sorted by Date, so the range is a binary search
+        dates = frame["Date"]
+        lo = 0 if start is None else dates.searchsorted(pd.Timestamp(start), "left")
+        hi = len(frame) if end is None else dates.searchsorted(pd.Timestamp(end), "right")
+        rows = frame.iloc[lo:hi]
+        if columns is not None:
+            missing = [col for col in columns if col not in frame.columns]
+            if missing:
+                raise ValueError(f"Unknown columns: {', '.join(missing)}")
+            rows = rows[["Date"] + [col for col in columns if col != "Date"]]
+        return rows.copy()
+
+    def panel(self, tickers, field="Close", start=None, end=None):
+        """
+        One field of many tickers side by side
+
+        Parameters:
+        tickers (list): Ticker symbols
+        field (str): Column to return (default: "Close")
+        start, end (optional): Inclusive date bounds
+
+        Returns:
+        pandas.DataFrame: Indexed by Date with one column per ticker
+        """
+        series = {}
+        for ticker_symbol in tickers:
+            rows = self.get(ticker_symbol, start, end, columns=[field])
+            # Dividend and split rows share a Date with the price row
+            rows = rows.dropna(subset=[field]).drop_duplicates("Date", keep="last")
+            series[ticker_symbol] = rows.set_index("Date")[field]
+        if not series:
+            return pd.DataFrame()
+        return pd.DataFrame(series).sort_index()
+
+
+def frame_to_json(df):
+    return json.loads(df.to_json(orient="records", date_format="iso"))
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP front end for a QueryService
+
+    GET /tickers
+    GET /get?ticker=AAPL&start=2023-01-01&end=2023-06-30&columns=Close,Volume
+    GET /panel?tickers=AAPL,MSFT&field=Close&start=2023-01-01
+    GET /stats
+    """
+
+    service = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        start, end = params.get("start"), params.get("end")
+
+        try:
+            if url.path == "/tickers":
+                body = self.service.tickers()
+            elif url.path == "/get":
+                if "ticker" not in params:
+                    raise ValueError("Missing 'ticker' parameter")
+                columns = params["columns"].split(",") if "columns" in params else None
+                body = frame_to_json(
+                    self.service.get(params["ticker"], start, end, columns)
+                )
+            elif url.path == "/panel":
+                if "tickers" not in params:
+                    raise ValueError("Missing 'tickers' parameter")
+                panel = self.service.panel(
+                    params["tickers"].split(","), params.get("field", "Close"), start, end
+                )
+                body = frame_to_json(panel.reset_index())
+            elif url.path == "/stats":
+                body = self.service.cache.stats()
+            else:
+                self.send_json(404, {"error": f"Unknown path: {url.path}"})
+                return
+        except KeyError as e:
+            self.send_json(404, {"error": str(e.args[0])})
+            return
+        except ValueError as e:
+            self.send_json(400, {"error": str(e)})
+            return
+
+        self.send_json(200, body)
+
+    def send_json(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(service, host="127.0.0.1", port=8000):
+    """
+    Create (but do not start) an HTTP server for a QueryService
+
+    Parameters:
+    service (QueryService): The service to expose
+    host (str): Interface to bind (default: localhost only)
+    port (int): Port to bind, 0 picks a free one
+
+    Returns:
+    ThreadingHTTPServer: Call serve_forever() to start serving
+    """
+    handler = type("BoundQueryRequestHandler", (QueryRequestHandler,), {"service": service})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    """
+    Serve read-only queries over the scraped data
+    """
+    parser = argparse.ArgumentParser(
+        description="Serve cached, read-only queries over scraped stock data."
+    )
+    parser.add_argument(
+        "--data-dir", default="stock_data", help="Directory with scraped CSV files"
+    )
+    parser.add_argument("--period", default="1y", help="Period label of the files")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument(
+        "--cache-mb", type=int, default=256, help="Memory budget for cached frames"
+    )
+    args = parser.parse_args()
+
+    service = QueryService(args.data_dir, args.period, args.cache_mb * 1024 * 1024)
+    server = make_server(service, args.host, args.port)
+    print(f"Serving {os.path.abspath(args.data_dir)} on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
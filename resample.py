@@ -0,0 +1,151 @@
+import argparse
+import os
+import re
+
+import store
+
+# Calendar intervals, mapped to pandas period frequencies
+INTERVAL_PERIODS = {
+    "1wk": "W-FRI",  # Trading week ending Friday
+    "1mo": "M",
+    "3mo": "Q",
+}
+
+# N trading-day bars, e.g. "5d" or "10d"
+N_DAY_PATTERN = re.compile(r"^(\d+)d$")
+
+# How each column is combined into a bar
+AGGREGATIONS = {
+    "Date": "first",
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Adj_Close": "last",
+    "Volume": "sum",
+}
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Adj_Close"]
+
+
+def resample_bars(daily, interval):
+    """
+    Resample daily OHLCV bars of many tickers into coarser bars
+
+    All tickers are grouped in a single groupby, so the cost does not grow
+    with a per-ticker Python loop.
+
+    Parameters:
+    daily (pandas.DataFrame): Long frame with Ticker, Date and OHLCV columns,
+        as returned by store.load_daily_bars()
+    interval (str): "1wk", "1mo", "3mo" or "<N>d" for N trading-day bars
+
+    Returns:
+    pandas.DataFrame: One row per (Ticker, bar), Date is the first trading day
+        in the bar
+    """
+    bars = daily.dropna(subset=["Date"])
+    # Dividend and split rows carry no prices after cleaning
+    price_cols = [col for col in PRICE_COLUMNS if col in bars.columns]
+    if price_cols:
+        bars = bars.dropna(subset=price_cols, how="all")
+    bars = bars.sort_values(["Ticker", "Date"], kind="stable")
+
+    match = N_DAY_PATTERN.match(interval)
+    if interval not in INTERVAL_PERIODS and (not match or int(match.group(1)) < 1):
+        raise ValueError(f"Unsupported interval: {interval}")
+
+    agg = {col: how for col, how in AGGREGATIONS.items() if col in bars.columns}
+    # Nothing to resample, e.g. only header-only files were stale
+    if bars.empty:
+        return bars[["Ticker"] + list(agg)].reset_index(drop=True)
+
+    if interval in INTERVAL_PERIODS:
+        bar_key = bars["Date"].dt.to_period(INTERVAL_PERIODS[interval])
+    else:
+        bar_key = bars.groupby("Ticker").cumcount() // int(match.group(1))
+
+    resampled = bars.groupby([bars["Ticker"], bar_key.rename("Bar")], sort=True).agg(agg)
+    return resampled.reset_index(level="Bar", drop=True).reset_index()
+
+
+def resample_directory(data_dir, interval, period="1y", cache_dir=None):
+    """
+    Resample every stored ticker, reusing cached bars where still fresh
+
+    Resampled bars are cached per interval as CSV files under
+    "<data_dir>/resampled/<interval>/" in the same layout as the scraper
+    output. Only tickers whose daily file is newer than the cached file are
+    recomputed.
+
+    Parameters:
+    data_dir (str): Directory holding the scraper output
+    interval (str): See resample_bars()
+    period (str): Period label used in the filenames (default: "1y")
+    cache_dir (str, optional): Override the cache directory
+
+    Returns:
+    pandas.DataFrame: Resampled bars of all tickers
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(data_dir, "resampled", interval)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    daily_files = store.list_ticker_files(data_dir, period)
+
+    # Drop cached bars of tickers whose daily file is gone
+    for ticker_symbol, cached_path in store.list_ticker_files(cache_dir, period).items():
+        if ticker_symbol not in daily_files:
+            os.remove(cached_path)
+
+    stale = []
+    for ticker_symbol, path in daily_files.items():
+        cached_path = store.ticker_file_path(cache_dir, ticker_symbol, period)
+        if (
+            not os.path.exists(cached_path)
+            or os.path.getmtime(cached_path) < os.path.getmtime(path)
+        ):
+            stale.append(ticker_symbol)
+
+    if stale:
+        print(f"Resampling {len(stale)} tickers to {interval}...")
+        daily = store.load_daily_bars(data_dir, period, tickers=stale)
+        resampled = resample_bars(daily, interval)
+        bars_by_ticker = dict(list(resampled.groupby("Ticker", sort=False)))
+        for ticker_symbol in stale:
+            # Tickers without any bars get an empty file, so they stay cached
+            bars = bars_by_ticker.get(ticker_symbol, resampled.iloc[:0])
+            bars.drop(columns="Ticker").to_csv(
+                store.ticker_file_path(cache_dir, ticker_symbol, period), index=False
+            )
+
+    return store.load_daily_bars(cache_dir, period, tickers=list(daily_files))
+
+
+def main():
+    """
+    Resample stored daily data into weekly, monthly, quarterly or N-day bars
+    """
+    parser = argparse.ArgumentParser(
+        description="Resample stored daily stock data without scraping again."
+    )
+    parser.add_argument(
+        "--interval",
+        required=True,
+        help="Bar interval: 1wk, 1mo, 3mo or <N>d for N trading days (e.g., 5d)",
+    )
+    parser.add_argument(
+        "--data-dir", default="stock_data", help="Directory with scraped CSV files"
+    )
+    parser.add_argument("--period", default="1y", help="Period label of the files")
+    args = parser.parse_args()
+
+    bars = resample_directory(args.data_dir, args.interval, args.period)
+    print(
+        f"{len(bars)} {args.interval} bars for {bars['Ticker'].nunique()} tickers in "
+        f"{os.path.abspath(os.path.join(args.data_dir, 'resampled', args.interval))}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -8,31 +8,82 @@ import pandas as pd
 import time
 import random
 import os
+import sys
+import contextlib
 from dotenv import load_dotenv
 import argparse
 
+import profiling
+import quality
+import sinks
+import store
+
 load_dotenv()
 yahoo_email = os.getenv("YAHOO_EMAIL")
 yahoo_password = os.getenv("YAHOO_PASSWORD")
 
-print(f"YAHOO_EMAIL: {yahoo_email}")
-print(f"YAHOO_PASSWORD: {yahoo_password}")
+# Runs at import time, before main() can redirect progress output, so keep it
+# off stdout where --sink ndjson/arrow may be streaming data
+print(f"YAHOO_EMAIL: {yahoo_email}", file=sys.stderr)
+print(f"YAHOO_PASSWORD: {yahoo_password}", file=sys.stderr)
 
 
-def scrape_yahoo_finance_history(ticker_symbol, period="1y"):
+def scrape_yahoo_finance_history(
+    ticker_symbol, period="1y", sink=None, start=None, end=None
+):
     """
-    Scrape historical stock price data from Yahoo Finance using Selenium
+    Scrape historical stock price data from Yahoo Finance and write it out
+
+    The data is written once, after extraction has finished. Errors while
+    writing (e.g. a downstream consumer closing a streaming sink) are not
+    caught, so they abort the run instead of being retried as a scrape
+    failure.
 
     Parameters:
     ticker_symbol (str): The stock ticker symbol
     period (str): Time period to fetch data for (default: "1y" for 1 year)
+    sink (optional): Streaming sink from sinks.open_sink(); when given, the
+        data is written to the sink instead of a CSV file
+    start, end (optional): Fetch only this date window (inclusive) instead of
+        the whole period, e.g. to re-fetch a hole from a gap index
 
     Returns:
-    pandas.DataFrame: The scraped historical data
+    pandas.DataFrame: The scraped historical data, or None if scraping failed
+    """
+    if start is not None and end is not None:
+        start = pd.Timestamp(start).normalize()
+        end = pd.Timestamp(end).normalize()
+
+    df = fetch_yahoo_finance_history(ticker_symbol, period, start, end)
+    if df is None:
+        return None
+
+    if sink is not None:
+        sink.write(ticker_symbol, df)
+        print(f"Successfully streamed {ticker_symbol} data ({len(df)} rows)")
+    else:
+        # Windowed fetches are merged into the same file
+        output_file = store.ticker_file_path("", ticker_symbol, period)
+        merged = store.write_ticker_frame(df, output_file)
+        print(
+            f"Successfully saved {ticker_symbol} data to {output_file} ({len(df)} rows, {len(merged)} in file)"
+        )
+    return df
+
+
+def fetch_yahoo_finance_history(ticker_symbol, period="1y", start=None, end=None):
     """
-    # Generate output filename
-    output_file = f"{ticker_symbol}_historical_data_{period}.csv"
+    Log in and extract the historical price table using Selenium
+
+    Parameters:
+    ticker_symbol (str): The stock ticker symbol
+    period (str): Time period to fetch data for (default: "1y" for 1 year)
+    start, end (pandas.Timestamp, optional): Normalized date window (inclusive)
+        to fetch instead of the whole period
 
+    Returns:
+    pandas.DataFrame: The cleaned table, or None if it could not be scraped
+    """
     print(f"\n{'='*50}")
     print(f"Starting data collection for {ticker_symbol}")
     print(f"{'='*50}")
@@ -67,7 +118,7 @@ def scrape_yahoo_finance_history(ticker_symbol, period="1y"):
 
     try:
         # Navigate to Yahoo login page
-        login_url = "https://login.yahoo.com/"
+        login_url = os.getenv("YAHOO_LOGIN_URL", "https://login.yahoo.com/")
         print(f"Navigating to Yahoo login page for {ticker_symbol}...")
         driver.get(login_url)
         random_delay(2, 4)
@@ -171,12 +222,18 @@ def scrape_yahoo_finance_history(ticker_symbol, period="1y"):
             "1y": 86400 * 365,  # 1 year in seconds
         }
 
-        period_seconds = period_map.get(period, period_map["1y"])
-        period1 = current_time - period_seconds
-        period2 = current_time
+        if start is not None and end is not None:
+            # Window end is inclusive, so request up to the following midnight
+            period1 = int(start.tz_localize("UTC").timestamp())
+            period2 = int((end + pd.Timedelta(days=1)).tz_localize("UTC").timestamp())
+        else:
+            period_seconds = period_map.get(period, period_map["1y"])
+            period1 = current_time - period_seconds
+            period2 = current_time
 
         # Navigate directly to the URL with time parameters
-        url = f"https://finance.yahoo.com/quote/{ticker_symbol}/history?period1={period1}&period2={period2}&interval=1d&filter=history&frequency=1d&includeAdjustedClose=true"
+        finance_url = os.getenv("YAHOO_FINANCE_URL", "https://finance.yahoo.com")
+        url = f"{finance_url}/quote/{ticker_symbol}/history?period1={period1}&period2={period2}&interval=1d&filter=history&frequency=1d&includeAdjustedClose=true"
         print(f"Navigating to Yahoo Finance for {ticker_symbol}...")
         driver.get(url)
         random_delay(2, 3)
@@ -305,11 +362,6 @@ def scrape_yahoo_finance_history(ticker_symbol, period="1y"):
                 # Drop rows with all NaN values
                 df = df.dropna(how="all")
 
-                # Save to CSV
-                df.to_csv(output_file, index=False)
-                print(
-                    f"Successfully saved {ticker_symbol} data to {output_file} ({len(df)} rows)"
-                )
                 return df
         except Exception as e:
             print(f"Pandas extraction failed for {ticker_symbol}: {str(e)}")
@@ -390,11 +442,6 @@ def scrape_yahoo_finance_history(ticker_symbol, period="1y"):
                 # Drop rows with all NaN values
                 df = df.dropna(how="all")
 
-                # Save to CSV
-                df.to_csv(output_file, index=False)
-                print(
-                    f"Successfully saved {ticker_symbol} data to {output_file} ({len(df)} rows)"
-                )
                 return df
         except Exception as e:
             print(f"BeautifulSoup extraction failed for {ticker_symbol}: {str(e)}")
@@ -424,57 +471,141 @@ def main():
         nargs="*",
         help="List of stock tickers to scrape (e.g., AAPL MSFT GOOGL)",
     )
+    parser.add_argument(
+        "--gap-index",
+        help="Re-fetch only the date ranges listed in a gap index CSV written by quality.py",
+    )
+    parser.add_argument(
+        "--sink",
+        choices=["csv", "ndjson", "arrow"],
+        default="csv",
+        help="Output format: per-ticker CSV files (default) or a stream of NDJSON records / Arrow IPC record batches",
+    )
+    parser.add_argument(
+        "--sink-target",
+        default="-",
+        help="Where to stream ndjson/arrow output: '-' for stdout (default), a file or named pipe path, or tcp://host:port",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=profiling.PROFILE_MODES,
+        help="Profile each ticker with cProfile (cpu) or tracemalloc (mem)",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default="profiles",
+        help="Where to write per-ticker and merged profile reports (default: profiles)",
+    )
     args = parser.parse_args()
     tickers_to_scrape = args.tickers
 
-    # Create a directory for output files
-    output_dir = "stock_data"
-    os.makedirs(output_dir, exist_ok=True)
-
-    # Change to the output directory
-    os.chdir(output_dir)
-
-    # List of 10 stock tickers to scrape
-    tickers = tickers_to_scrape  # Use the provided or default tickers
-
-    # Print start message
-    print("\nStarting Yahoo Finance Historical Data Scraper")
-    print(
-        f"Scraping 1-year historical data for {len(tickers)} stocks: {', '.join(tickers)}"
-    )
-    print(f"Output directory: {os.path.abspath(output_dir)}\n")
-
-    # Track successful and failed tickers
-    successful = []
-    failed = []
+    # Each job is (ticker, window); a window of None means the whole period
+    if args.gap_index:
+        gaps = quality.read_gap_index(args.gap_index)
+        if tickers_to_scrape:
+            gaps = gaps[gaps["Ticker"].isin(tickers_to_scrape)]
+        jobs = [
+            (gap.Ticker, (gap.Start, gap.End)) for gap in gaps.itertuples(index=False)
+        ]
+    else:
+        jobs = [(ticker, None) for ticker in tickers_to_scrape or []]
+
+    # Resolve before changing into the output directory
+    profiler = None
+    if args.profile:
+        profiler = profiling.RunProfiler(args.profile, os.path.abspath(args.profile_dir))
+
+    if args.sink == "csv":
+        # Create a directory for output files
+        output_dir = "stock_data"
+        os.makedirs(output_dir, exist_ok=True)
+
+        # Change to the output directory
+        os.chdir(output_dir)
+        sink = None
+        log_stream = sys.stdout
+    else:
+        # Stream results directly, no intermediate files. Progress messages
+        # go to stderr so they cannot corrupt a stream written to stdout.
+        output_dir = None
+        sink = sinks.open_sink(args.sink, args.sink_target)
+        log_stream = sys.stderr
+
+    # Tickers in job order (a ticker repeats when it has several gap ranges)
+    tickers = [ticker for ticker, _ in jobs]
+
+    with contextlib.redirect_stdout(log_stream):
+        # Print start message
+        print("\nStarting Yahoo Finance Historical Data Scraper")
+        if args.gap_index:
+            print(
+                f"Re-fetching {len(jobs)} gap ranges from {args.gap_index} for: {', '.join(sorted(set(tickers)))}"
+            )
+        else:
+            print(
+                f"Scraping 1-year historical data for {len(tickers)} stocks: {', '.join(tickers)}"
+            )
+        if sink is None:
+            print(f"Output directory: {os.path.abspath(output_dir)}\n")
+        else:
+            print(f"Streaming {args.sink} output to: {args.sink_target}\n")
 
-    # Process each ticker
-    for i, ticker in enumerate(tickers, 1):
-        print(f"\nProcessing ticker {i} of {len(tickers)}: {ticker}")
+        # Track successful and failed tickers
+        successful = []
+        failed = []
 
-        # Add a delay between tickers to avoid rate limiting
-        if i > 1:
-            delay = random.uniform(3, 7)
-            print(f"Waiting {delay:.1f} seconds before processing next ticker...")
-            time.sleep(delay)
+        try:
+            # Process each ticker
+            for i, (ticker, window) in enumerate(jobs, 1):
+                print(f"\nProcessing ticker {i} of {len(jobs)}: {ticker}")
 
-        # Attempt to scrape data for this ticker
-        df = scrape_yahoo_finance_history(ticker)
+                # Add a delay between tickers to avoid rate limiting
+                if i > 1:
+                    delay = random.uniform(3, 7)
+                    print(
+                        f"Waiting {delay:.1f} seconds before processing next ticker..."
+                    )
+                    time.sleep(delay)
+
+                # Attempt to scrape data for this ticker
+                scrape_kwargs = {"sink": sink}
+                label = ticker
+                if window is not None:
+                    print(f"Window: {window[0]:%Y-%m-%d} to {window[1]:%Y-%m-%d}")
+                    scrape_kwargs.update(start=window[0], end=window[1])
+                    label = f"{ticker}_{window[0]:%Y%m%d}-{window[1]:%Y%m%d}"
+
+                if profiler is not None:
+                    df = profiler.profile(
+                        label, scrape_yahoo_finance_history, ticker, **scrape_kwargs
+                    )
+                else:
+                    df = scrape_yahoo_finance_history(ticker, **scrape_kwargs)
 
-        if df is not None and not df.empty:
-            successful.append(ticker)
+                if df is not None and not df.empty:
+                    successful.append(ticker)
+                else:
+                    failed.append(ticker)
+        finally:
+            if sink is not None:
+                sink.close()
+            if profiler is not None:
+                profile_report = profiler.finish()
+
+        # Print summary
+        print("\n" + "=" * 50)
+        print("SCRAPING COMPLETE")
+        print("=" * 50)
+        print(f"Total tickers processed: {len(tickers)}")
+        print(f"Successful: {len(successful)} ({', '.join(successful)})")
+        print(f"Failed: {len(failed)} ({', '.join(failed) if failed else 'None'})")
+        if sink is None:
+            print(f"Data saved to: {os.path.abspath(output_dir)}")
         else:
-            failed.append(ticker)
-
-    # Print summary
-    print("\n" + "=" * 50)
-    print("SCRAPING COMPLETE")
-    print("=" * 50)
-    print(f"Total tickers processed: {len(tickers)}")
-    print(f"Successful: {len(successful)} ({', '.join(successful)})")
-    print(f"Failed: {len(failed)} ({', '.join(failed) if failed else 'None'})")
-    print(f"Data saved to: {os.path.abspath(output_dir)}")
-    print("=" * 50)
+            print(f"Data streamed to: {args.sink_target}")
+        if profiler is not None:
+            print(f"Profiles saved to: {profiler.output_dir} (merged: {profile_report})")
+        print("=" * 50)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,143 @@
+import socket
+import sys
+
+import pandas as pd
+
+# Fixed column layout for streamed records, so every ticker produces the same
+# schema regardless of which columns the scraped table happened to contain.
+STREAM_COLUMNS = ["Ticker", "Date", "Open", "High", "Low", "Close", "Adj_Close", "Volume"]
+
+
+def open_stream(target):
+    """
+    Open a binary, writable stream for a sink target
+
+    Parameters:
+    target (str): "-" for stdout, "tcp://host:port" for a TCP socket,
+        anything else is treated as a path (regular file or named pipe)
+
+    Returns:
+    tuple: (stream, closer) where closer() releases the underlying resource
+    """
+    if target == "-":
+        stream = sys.stdout.buffer
+        return stream, stream.flush
+
+    if target.startswith("tcp://"):
+        host, _, port = target[len("tcp://") :].rpartition(":")
+        if not host or not port.isdigit():
+            raise ValueError(f"Invalid TCP sink target: {target}")
+        sock = socket.create_connection((host, int(port)))
+        stream = sock.makefile("wb")
+
+        def close_socket():
+            stream.close()
+            sock.close()
+
+        return stream, close_socket
+
+    # Opening a named pipe blocks until a reader is attached, which is the
+    # behaviour we want for feeding a downstream loader.
+    stream = open(target, "wb")
+    return stream, stream.close
+
+
+def to_stream_frame(ticker_symbol, df):
+    """
+    Normalize a cleaned ticker DataFrame to the fixed streaming schema
+
+    Parameters:
+    ticker_symbol (str): The stock ticker symbol
+    df (pandas.DataFrame): The cleaned historical data
+
+    Returns:
+    pandas.DataFrame: Data with STREAM_COLUMNS, Date as datetime and prices as float
+    """
+    frame = df.reindex(columns=STREAM_COLUMNS[1:])
+    frame.insert(0, "Ticker", ticker_symbol)
+    frame["Date"] = pd.to_datetime(frame["Date"], errors="coerce")
+    for col in STREAM_COLUMNS[2:]:
+        frame[col] = pd.to_numeric(frame[col], errors="coerce").astype("float64")
+    return frame
+
+
+class NdjsonSink:
+    """
+    Stream each ticker's rows as newline-delimited JSON records
+    """
+
+    def __init__(self, stream, closer=None):
+        self.stream = stream
+        self.closer = closer
+
+    def write(self, ticker_symbol, df):
+        frame = to_stream_frame(ticker_symbol, df)
+        if frame.empty:
+            return
+        payload = frame.to_json(orient="records", lines=True, date_format="iso")
+        if not payload.endswith("\n"):
+            payload += "\n"
+        self.stream.write(payload.encode("utf-8"))
+        self.stream.flush()
+
+    def close(self):
+        if self.closer is not None:
+            self.closer()
+
+
+class ArrowSink:
+    """
+    Stream each ticker's rows as a record batch of an Arrow IPC stream
+    """
+
+    def __init__(self, stream, closer=None):
+        import pyarrow as pa
+
+        self.pa = pa
+        self.stream = stream
+        self.closer = closer
+        self.schema = pa.schema(
+            [("Ticker", pa.string()), ("Date", pa.timestamp("ns"))]
+            + [(col, pa.float64()) for col in STREAM_COLUMNS[2:]]
+        )
+        self.writer = pa.ipc.new_stream(stream, self.schema)
+
+    def write(self, ticker_symbol, df):
+        frame = to_stream_frame(ticker_symbol, df)
+        batch = self.pa.RecordBatch.from_pandas(
+            frame, schema=self.schema, preserve_index=False
+        )
+        self.writer.write_batch(batch)
+        self.stream.flush()
+
+    def close(self):
+        self.writer.close()
+        if self.closer is not None:
+            self.closer()
+
+
+SINK_TYPES = {
+    "ndjson": NdjsonSink,
+    "arrow": ArrowSink,
+}
+
+
+def open_sink(kind, target="-"):
+    """
+    Create a streaming sink
+
+    Parameters:
+    kind (str): One of SINK_TYPES ("ndjson" or "arrow")
+    target (str): Where to stream to, see open_stream()
+
+    Returns:
+    NdjsonSink or ArrowSink: An open sink; call close() when done
+    """
+    if kind not in SINK_TYPES:
+        raise ValueError(f"Unknown sink type: {kind}")
+    stream, closer = open_stream(target)
+    try:
+        return SINK_TYPES[kind](stream, closer)
+    except Exception:
+        closer()
+        raise
@@ -0,0 +1,314 @@
+import argparse
+import contextlib
+import glob
+import os
+import re
+import stat
+import tempfile
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, atomic renames still apply
+    fcntl = None
+
+FILE_MARKER = "_historical_data_"
+
+# Label of a windowed fetch, e.g. "20230105-20230106"
+WINDOW_LABEL_PATTERN = re.compile(r"^\d{8}-\d{8}$")
+
+
+def ticker_file_path(data_dir, ticker_symbol, period="1y"):
+    """
+    Path of the CSV file the scraper writes for a ticker
+
+    Parameters:
+    data_dir (str): Directory holding the scraper output
+    ticker_symbol (str): The stock ticker symbol
+    period (str): Period label used in the filename (default: "1y")
+
+    Returns:
+    str: The file path
+    """
+    return os.path.join(data_dir, f"{ticker_symbol}{FILE_MARKER}{period}.csv")
+
+
+def list_ticker_files(data_dir, period="1y"):
+    """
+    Find the per-ticker CSV files in a data directory
+
+    Parameters:
+    data_dir (str): Directory holding the scraper output
+    period (str): Period label used in the filenames (default: "1y")
+
+    Returns:
+    dict: Mapping of ticker symbol to file path, sorted by ticker
+    """
+    suffix = f"{FILE_MARKER}{period}.csv"
+    files = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, f"*{suffix}"))):
+        files[os.path.basename(path)[: -len(suffix)]] = path
+    return files
+
+
+def read_ticker_frame(path):
+    """
+    Read one ticker CSV file written by the scraper
+
+    Parameters:
+    path (str): The file path
+
+    Returns:
+    pandas.DataFrame: The data with Date parsed as datetime
+    """
+    df = pd.read_csv(path)
+    if "Date" in df.columns:
+        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    return df
+
+
+def load_daily_bars(data_dir, period="1y", tickers=None):
+    """
+    Load stored daily bars for many tickers into one long DataFrame
+
+    Parameters:
+    data_dir (str): Directory holding the scraper output
+    period (str): Period label used in the filenames (default: "1y")
+    tickers (list, optional): Only load these tickers (default: all found)
+
+    Returns:
+    pandas.DataFrame: Rows of all tickers with a leading "Ticker" column
+    """
+    files = list_ticker_files(data_dir, period)
+    if tickers is not None:
+        files = {t: files[t] for t in tickers if t in files}
+
+    frames = []
+    for ticker_symbol, path in files.items():
+        df = read_ticker_frame(path)
+        if df.empty:
+            continue
+        df.insert(0, "Ticker", ticker_symbol)
+        frames.append(df)
+
+    if not frames:
+        return pd.DataFrame(
+            {"Ticker": pd.Series(dtype=object), "Date": pd.Series(dtype="datetime64[ns]")}
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+@contextlib.contextmanager
+def locked(path):
+    """
+    Hold an exclusive lock for read-modify-write of a ticker file
+
+    Writers serialize on a "<path>.lock" file; readers never need the lock
+    because files are only ever replaced atomically.
+
+    Parameters:
+    path (str): The ticker file path
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(f"{path}.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def file_mode(path):
+    """
+    Permissions for (re)writing a file
+
+    Parameters:
+    path (str): The file path
+
+    Returns:
+    int: The existing file's mode, or 0o666 minus the umask for a new file
+    """
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def atomic_write_csv(df, path):
+    """
+    Write a CSV file so readers see either the old or the new file, never
+    a partial one
+
+    The data is staged to a temporary file in the same directory, synced to
+    disk and renamed over the target. The new file keeps the target's
+    permissions, or gets the usual umask-based ones if it is new.
+
+    Parameters:
+    df (pandas.DataFrame): The data to write
+    path (str): The target file path
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", newline="") as tmp_file:
+            df.to_csv(tmp_file, index=False)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        # mkstemp creates the file as 0600, which os.replace would carry over
+        os.chmod(tmp_path, file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def merge_frames(existing, new):
+    """
+    Merge new rows into existing rows keyed on (Ticker, Date), last write wins
+
+    Every existing row whose key appears in the new rows is replaced by the
+    new rows for that key, so a re-fetched day (including its dividend or
+    split rows) fully supersedes the old one. Existing rows without a Date
+    cannot be keyed and are dropped.
+
+    Parameters:
+    existing (pandas.DataFrame): Rows already stored
+    new (pandas.DataFrame): Freshly scraped rows
+
+    Returns:
+    pandas.DataFrame: Merged rows sorted by key, without duplicate rows
+    """
+    key = [col for col in ["Ticker", "Date"] if col in new.columns]
+    if "Date" not in key or "Date" not in existing.columns:
+        return new.reset_index(drop=True)
+
+    existing = existing.dropna(subset=["Date"])
+    replaced = pd.MultiIndex.from_frame(existing[key]).isin(
+        pd.MultiIndex.from_frame(new[key])
+    )
+    merged = pd.concat([existing[~replaced], new], ignore_index=True)
+    merged = merged.drop_duplicates()
+    return merged.sort_values(key, kind="stable", na_position="last").reset_index(
+        drop=True
+    )
+
+
+def write_ticker_frame(df, path):
+    """
+    Merge rows into a ticker file and replace it atomically
+
+    Parameters:
+    df (pandas.DataFrame): Freshly scraped rows
+    path (str): The ticker file path
+
+    Returns:
+    pandas.DataFrame: The merged file contents
+    """
+    with locked(path):
+        existing = read_ticker_frame(path) if os.path.exists(path) else df.iloc[:0]
+        df = merge_frames(existing, df)
+        atomic_write_csv(df, path)
+    return df
+
+
+def list_partitions(data_dir):
+    """
+    Find every file the scraper wrote per ticker, including windowed fetches
+
+    Parameters:
+    data_dir (str): Directory holding the scraper output
+
+    Returns:
+    dict: Mapping of ticker symbol to a list of (label, path), label being the
+        period or window part of the filename
+    """
+    partitions = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, f"*{FILE_MARKER}*.csv"))):
+        name = os.path.basename(path)[: -len(".csv")]
+        ticker_symbol, _, label = name.rpartition(FILE_MARKER)
+        partitions.setdefault(ticker_symbol, []).append((label, path))
+    return partitions
+
+
+def compact(data_dir, period="1y"):
+    """
+    Rewrite fragmented per-ticker partitions into one sorted, de-duplicated
+    file per ticker
+
+    The period file and the windowed fetch files (and any older partial
+    writes) are merged in modification order, so the newest data wins
+    whichever file it is in. The fragments are removed afterwards.
+
+    Parameters:
+    data_dir (str): Directory holding the scraper output
+    period (str): Period label of the files to compact into (default: "1y")
+
+    Returns:
+    dict: Mapping of ticker symbol to the number of rows after compaction
+    """
+    compacted = {}
+    for ticker_symbol, partitions in list_partitions(data_dir).items():
+        path = ticker_file_path(data_dir, ticker_symbol, period)
+        fragments = [
+            fragment_path
+            for label, fragment_path in partitions
+            if WINDOW_LABEL_PATTERN.match(label)
+        ]
+
+        with locked(path):
+            # The period file goes first so it loses ties on mtime
+            sources = ([path] if os.path.exists(path) else []) + fragments
+            if not sources:
+                continue
+            merged = None
+            for source_path in sorted(sources, key=os.path.getmtime):
+                frame = read_ticker_frame(source_path)
+                # Merging into an empty frame still sorts and de-duplicates
+                merged = merge_frames(
+                    frame.iloc[:0] if merged is None else merged, frame
+                )
+            atomic_write_csv(merged, path)
+            for fragment_path in fragments:
+                os.remove(fragment_path)
+
+        compacted[ticker_symbol] = len(merged)
+    return compacted
+
+
+def main():
+    """
+    Maintenance commands for the scraper output directory
+    """
+    parser = argparse.ArgumentParser(
+        description="Maintain the per-ticker CSV files written by the scraper."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    compact_parser = subparsers.add_parser(
+        "compact",
+        help="Merge windowed fetch files into sorted, de-duplicated per-ticker files",
+    )
+    compact_parser.add_argument(
+        "--data-dir", default="stock_data", help="Directory with scraped CSV files"
+    )
+    compact_parser.add_argument(
+        "--period", default="1y", help="Period label of the files"
+    )
+    args = parser.parse_args()
+
+    if args.command == "compact":
+        compacted = compact(args.data_dir, args.period)
+        for ticker_symbol, rows in compacted.items():
+            print(f"{ticker_symbol}: {rows} rows")
+        print(f"Compacted {len(compacted)} tickers in {os.path.abspath(args.data_dir)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import io
+import os
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fake_yahoo import (
+    COOKIE_LAYOUTS,
+    TABLE_LAYOUTS,
+    FakeYahooConfig,
+    FakeYahooServer,
+    history_rows,
+)
+from loadtest import process_tree_rss, run_load_test, split_tickers
+
+
+@pytest.fixture
+def start_server():
+    servers = []
+
+    def start(**config):
+        server = FakeYahooServer(FakeYahooConfig(**config))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def fetch(url):
+    with urllib.request.urlopen(url) as response:
+        return response.read().decode("utf-8")
+
+
+def history_url(server, ticker="AAA"):
+    period2 = int(time.time())
+    return f"{server.url}/quote/{ticker}/history?period1={period2 - 86400 * 30}&period2={period2}"
+
+
+def test_login_flow_pages(start_server):
+    server = start_server()
+    assert 'name="username"' in fetch(f"{server.url}/")
+    password_page = fetch(f"{server.url}/account/challenge/password?username=x")
+    assert 'name="password"' in password_page
+    assert "Sign in" in password_page
+
+
+@pytest.mark.parametrize("table_layout", sorted(TABLE_LAYOUTS))
+def test_history_table_layouts(start_server, table_layout):
+    server = start_server(table_layout=table_layout, cookie_layout="agree")
+    page = fetch(history_url(server))
+
+    assert ">Agree</button>" in page
+    df = pd.read_html(io.StringIO(page))[0]
+    assert df.columns[0] == "Date"
+    assert df.columns[4].startswith("Close")
+    assert 19 <= len(df) <= 24
+    # Newest first and identical data for the same request
+    assert pd.to_datetime(df["Date"]).is_monotonic_decreasing
+    assert page == fetch(history_url(server))
+
+
+def test_windowed_history_matches_full_period():
+    period2 = int(time.time())
+    full = history_rows("AAA", period2 - 86400 * 365, period2)
+    window = history_rows("AAA", period2 - 86400 * 40, period2 - 86400 * 20)
+
+    assert 10 <= len(window) < len(full)
+    assert set(window) <= set(full)
+
+
+def test_cookie_layout_none(start_server):
+    server = start_server(cookie_layout="none")
+    assert 'id="consent"' not in fetch(history_url(server))
+    assert set(COOKIE_LAYOUTS) >= {"accept-all", "consent-id", "accept-class"}
+
+
+def test_errors_and_throttling(start_server):
+    failing = start_server(error_rate=1.0)
+    with pytest.raises(urllib.error.HTTPError) as error:
+        fetch(history_url(failing))
+    assert error.value.code == 500
+
+    throttled = start_server(rate_limit=1)
+    fetch(history_url(throttled))
+    with pytest.raises(urllib.error.HTTPError) as error:
+        fetch(history_url(throttled))
+    assert error.value.code == 429
+    assert throttled.stats() == {200: 1, 429: 1}
+
+
+def test_split_tickers():
+    assert split_tickers(["A", "B", "C"], 2) == [["A", "C"], ["B"]]
+    assert split_tickers(["A"], 4) == [["A"]]
+
+
+def test_run_load_test_reports_throughput(tmp_path):
+    # Stand-in entry point: tickers starting with "X" get no file, and those
+    # starting with "E" only a header, like a scrape whose table was empty
+    script = tmp_path / "fake_scraper.py"
+    script.write_text(
+        "import os, sys\n"
+        "os.makedirs('stock_data', exist_ok=True)\n"
+        "assert os.environ['YAHOO_FINANCE_URL'] == 'http://fake'\n"
+        "for ticker in sys.argv[2:]:\n"
+        "    if ticker.startswith('X'):\n"
+        "        continue\n"
+        "    rows = '' if ticker.startswith('E') else '2023-01-03,1.0\\n'\n"
+        "    with open(f'stock_data/{ticker}_historical_data_1y.csv', 'w') as f:\n"
+        "        f.write('Date,Close\\n' + rows)\n"
+    )
+
+    result = run_load_test(
+        ["AAA", "BBB", "XXX", "EEE"], 2, "http://fake", script=str(script)
+    )
+
+    assert result["workers"] == 2
+    assert result["successful"] == 2
+    assert result["failed"] == 2
+    assert result["failure_rate"] == pytest.approx(1 / 2)
+    assert result["tickers_per_minute"] > 0
+
+
+def test_process_tree_rss_includes_descendants():
+    if process_tree_rss([]) is None:
+        pytest.skip("needs /proc")
+    child = subprocess.Popen(
+        [sys.executable, "-c", "import time; data = bytearray(50 * 2**20); time.sleep(30)"]
+    )
+    try:
+        time.sleep(1)
+        child_rss = process_tree_rss([child.pid])
+        assert child_rss > 50 * 2**20
+        assert process_tree_rss([os.getpid()]) > child_rss
+    finally:
+        child.kill()
+        child.wait()
+
+
+def test_run_load_test_peak_memory_sums_concurrent_workers(tmp_path):
+    if process_tree_rss([]) is None:
+        pytest.skip("needs /proc")
+    script = tmp_path / "fake_scraper.py"
+    script.write_text("import time\ndata = bytearray(40 * 2**20)\ntime.sleep(1.5)\n")
+
+    result = run_load_test(["AAA", "BBB"], 2, "http://fake", script=str(script))
+
+    # Two workers holding 40 MB each at the same time
+    assert result["peak_rss_mb"] > 80
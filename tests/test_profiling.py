@@ -0,0 +1,87 @@
+import os
+import pstats
+import sys
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from profiling import RunProfiler
+from scraper import main as scraper_main
+
+
+def build_rows(n):
+    return [str(i) * 10 for i in range(n)]
+
+
+def test_cpu_profiles_per_call_and_merged(tmp_path):
+    profiler = RunProfiler("cpu", str(tmp_path))
+    assert len(profiler.profile("AAA", build_rows, 1000)) == 1000
+    profiler.profile("BBB", build_rows, 10)
+    merged_file = profiler.finish()
+
+    assert os.path.exists(tmp_path / "AAA.pstats")
+    assert "build_rows" in (tmp_path / "BBB_cpu.txt").read_text()
+    merged = pstats.Stats(merged_file)
+    calls = [
+        stat[0] for func, stat in merged.stats.items() if func[2] == "build_rows"
+    ]
+    assert calls == [2]
+    assert (tmp_path / "run_cpu.txt").exists()
+
+
+def test_cpu_profile_is_written_when_call_fails(tmp_path):
+    profiler = RunProfiler("cpu", str(tmp_path))
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        profiler.profile("AAA", fail)
+    assert os.path.exists(tmp_path / "AAA.pstats")
+
+
+def test_mem_reports_top_allocations(tmp_path):
+    profiler = RunProfiler("mem", str(tmp_path))
+    kept = profiler.profile("AAA", build_rows, 20000)
+    report_file = profiler.finish()
+
+    report = (tmp_path / "AAA_mem.txt").read_text()
+    assert "Peak traced memory during call" in report
+    assert "test_profiling.py" in report
+    assert "AAA:" in open(report_file).read()
+    assert len(kept) == 20000
+
+
+def test_unknown_mode(tmp_path):
+    with pytest.raises(ValueError):
+        RunProfiler("gpu", str(tmp_path))
+
+
+@pytest.fixture
+def in_tmp_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@patch("scraper.scrape_yahoo_finance_history")
+@patch("scraper.os.chdir")
+def test_main_profiles_each_ticker(mock_chdir, mock_scrape_func, in_tmp_path):
+    mock_scrape_func.return_value = pd.DataFrame({"Date": ["2023-01-03"], "Close": [1.0]})
+    profile_dir = in_tmp_path / "profiles"
+    cli_args = ["scraper.py", "--tickers", "AAA", "BBB", "--profile", "cpu"]
+
+    with patch.object(sys, "argv", cli_args), patch("scraper.time.sleep"):
+        scraper_main()
+
+    assert mock_scrape_func.call_count == 2
+    assert sorted(os.listdir(profile_dir)) == [
+        "AAA.pstats",
+        "AAA_cpu.txt",
+        "BBB.pstats",
+        "BBB_cpu.txt",
+        "run.pstats",
+        "run_cpu.txt",
+    ]
@@ -0,0 +1,133 @@
+import os
+import sys
+from unittest.mock import patch
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from quality import (
+    build_gap_index,
+    check_rows,
+    missing_days,
+    trading_sessions,
+    validate_directory,
+)
+from scraper import main as scraper_main
+import store
+
+
+def make_daily(ticker, dates):
+    return pd.DataFrame(
+        {
+            "Ticker": ticker,
+            "Date": pd.to_datetime(dates),
+            "Open": 10.0,
+            "High": 11.0,
+            "Low": 9.0,
+            "Close": 10.5,
+            "Adj_Close": 10.5,
+            "Volume": 1000.0,
+        }
+    )
+
+
+def test_trading_sessions_skip_weekends_and_holidays():
+    sessions = trading_sessions("2023-04-05", "2023-04-11")
+    # Good Friday (Apr 7) and the weekend are not trading days
+    assert list(sessions.strftime("%m-%d")) == ["04-05", "04-06", "04-10", "04-11"]
+
+
+def test_trading_sessions_keep_dec_31_before_saturday_new_year():
+    sessions = trading_sessions("2021-12-29", "2022-01-04")
+    assert list(sessions.strftime("%m-%d")) == ["12-29", "12-30", "12-31", "01-03", "01-04"]
+    # A Sunday New Year's Day is observed on the Monday
+    assert "2023-01-02" not in trading_sessions("2022-12-30", "2023-01-03")
+
+
+def test_check_rows_flags_bad_rows():
+    daily = make_daily("AAA", ["2023-01-03", "2023-01-04", "2023-01-05", "2023-01-06"])
+    daily.loc[0, "High"] = 8.0  # High below Low
+    daily.loc[1, "Volume"] = -5.0
+    daily.loc[2, "Close"] = None  # Left NaN by errors="coerce"
+    dividend = pd.DataFrame(
+        {"Ticker": ["AAA"], "Date": [pd.Timestamp("2023-01-06")], "Open": [None]}
+    )
+    unparsed = pd.DataFrame({"Ticker": ["AAA"], "Date": [pd.NaT], "Open": [1.0]})
+
+    issues = check_rows(pd.concat([daily, dividend, unparsed], ignore_index=True))
+
+    found = set(zip(issues["Date"].dt.strftime("%m-%d").fillna("NaT"), issues["Issue"]))
+    assert found == {
+        ("01-03", "ohlc_inconsistent"),
+        ("01-04", "negative_volume"),
+        ("01-05", "nan_values"),
+        ("NaT", "unparsed_date"),
+    }
+
+
+def test_missing_days_across_tickers():
+    daily = pd.concat(
+        [
+            make_daily("AAA", ["2023-01-03", "2023-01-06"]),
+            make_daily("BBB", ["2023-01-03", "2023-01-04", "2023-01-05"]),
+        ]
+    )
+    missing = missing_days(daily)
+    assert missing["Ticker"].tolist() == ["AAA", "AAA"]
+    assert missing["Date"].dt.strftime("%m-%d").tolist() == ["01-04", "01-05"]
+
+    missing = missing_days(daily, end="2023-01-06")
+    assert (missing["Ticker"] == "BBB").sum() == 1
+
+
+def test_gap_index_merges_consecutive_trading_days():
+    issues = pd.DataFrame(
+        {
+            "Ticker": ["AAA", "AAA", "AAA", "AAA", "BBB"],
+            # Fri, Mon, Mon again, a week later, and another ticker
+            "Date": pd.to_datetime(
+                ["2023-01-06", "2023-01-09", "2023-01-09", "2023-01-17", "2023-01-09"]
+            ),
+            "Issue": ["missing_day", "nan_values", "ohlc_inconsistent", "missing_day", "missing_day"],
+        }
+    )
+    gaps = build_gap_index(issues)
+
+    assert gaps["Ticker"].tolist() == ["AAA", "AAA", "BBB"]
+    assert gaps.loc[0, "Start"] == pd.Timestamp("2023-01-06")
+    assert gaps.loc[0, "End"] == pd.Timestamp("2023-01-09")
+    assert gaps.loc[0, "Days"] == 2
+    assert gaps.loc[0, "Issues"] == "missing_day,nan_values,ohlc_inconsistent"
+
+
+def test_validate_directory(tmp_path):
+    daily = make_daily("AAA", ["2023-01-03", "2023-01-04", "2023-01-06"])
+    daily.drop(columns="Ticker").to_csv(
+        store.ticker_file_path(tmp_path, "AAA"), index=False
+    )
+    issues, gaps = validate_directory(str(tmp_path))
+    assert issues["Issue"].tolist() == ["missing_day"]
+    assert gaps.loc[0, "Start"] == pd.Timestamp("2023-01-05")
+
+
+@patch("scraper.scrape_yahoo_finance_history")
+@patch("scraper.os.makedirs")
+@patch("scraper.os.chdir")
+def test_main_refetches_gap_windows(mock_chdir, mock_makedirs, mock_scrape_func, tmp_path):
+    gap_file = tmp_path / "gap_index.csv"
+    gap_file.write_text(
+        "Ticker,Start,End,Days,Issues\n"
+        "AAA,2023-01-05,2023-01-06,2,missing_day\n"
+        "BBB,2023-02-01,2023-02-01,1,nan_values\n"
+    )
+    mock_scrape_func.return_value = pd.DataFrame({"Date": ["2023-01-05"], "Close": [1.0]})
+
+    with patch.object(sys, "argv", ["scraper.py", "--gap-index", str(gap_file)]):
+        with patch("scraper.time.sleep"):
+            scraper_main()
+
+    calls = mock_scrape_func.call_args_list
+    assert [c.args[0] for c in calls] == ["AAA", "BBB"]
+    assert calls[0].kwargs["start"] == pd.Timestamp("2023-01-05")
+    assert calls[0].kwargs["end"] == pd.Timestamp("2023-01-06")
@@ -0,0 +1,108 @@
+import json
+import os
+import sys
+import threading
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from query import FrameCache, QueryService, make_server
+import store
+
+
+def write_ticker(data_dir, ticker, dates, close):
+    df = pd.DataFrame(
+        {"Date": pd.to_datetime(dates), "Close": close, "Volume": [100] * len(dates)}
+    )
+    store.write_ticker_frame(df, store.ticker_file_path(data_dir, ticker))
+
+
+@pytest.fixture
+def service(tmp_path):
+    write_ticker(tmp_path, "AAA", ["2023-01-05", "2023-01-03", "2023-01-04"], [3.0, 1.0, 2.0])
+    write_ticker(tmp_path, "BBB", ["2023-01-03", "2023-01-05"], [10.0, 30.0])
+    return QueryService(str(tmp_path))
+
+
+def test_get_slices_by_date_and_columns(service):
+    rows = service.get("AAA", start="2023-01-04", end="2023-01-05", columns=["Close"])
+    assert list(rows.columns) == ["Date", "Close"]
+    assert rows["Close"].tolist() == [2.0, 3.0]
+
+    with pytest.raises(KeyError):
+        service.get("ZZZ")
+    with pytest.raises(ValueError):
+        service.get("AAA", columns=["Nope"])
+
+
+def test_get_rejects_paths_outside_data_dir(service, tmp_path):
+    outside = tmp_path.parent / "x_historical_data_1y.csv"
+    pd.DataFrame({"Date": ["2023-01-03"], "Close": [1.0]}).to_csv(outside, index=False)
+    try:
+        for ticker in ["../x", f"{tmp_path.parent}/x", "..\\x"]:
+            with pytest.raises(KeyError):
+                service.get(ticker)
+    finally:
+        outside.unlink()
+
+
+def test_panel_aligns_tickers_on_date(service):
+    panel = service.panel(["AAA", "BBB"], start="2023-01-04")
+    assert list(panel.columns) == ["AAA", "BBB"]
+    assert panel.loc["2023-01-05"].tolist() == [3.0, 30.0]
+    assert pd.isna(panel.loc["2023-01-04", "BBB"])
+
+
+def test_cache_hits_until_file_is_rewritten(service, tmp_path):
+    service.get("AAA")
+    service.get("AAA", start="2023-01-04")
+    assert service.cache.stats()["hits"] == 1
+
+    write_ticker(tmp_path, "AAA", ["2023-01-06"], [4.0])
+    assert service.get("AAA")["Close"].tolist() == [1.0, 2.0, 3.0, 4.0]
+    assert service.cache.stats()["misses"] == 2
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    for ticker in ["AAA", "BBB", "CCC"]:
+        write_ticker(tmp_path, ticker, ["2023-01-03"], [1.0])
+    paths = [store.ticker_file_path(tmp_path, t) for t in ["AAA", "BBB", "CCC"]]
+
+    probe = FrameCache()
+    probe.get(paths[0])
+    cache = FrameCache(max_bytes=probe.total_bytes * 2)
+    cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])
+    cache.get(paths[2])
+
+    assert list(cache.entries) == [paths[0], paths[2]]
+    assert cache.total_bytes <= cache.max_bytes
+
+
+def test_http_endpoints(service):
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    try:
+        with urllib.request.urlopen(f"{base}/tickers") as response:
+            assert json.load(response) == ["AAA", "BBB"]
+        with urllib.request.urlopen(f"{base}/get?ticker=AAA&end=2023-01-03") as response:
+            rows = json.load(response)
+        assert len(rows) == 1 and rows[0]["Close"] == 1.0
+        with urllib.request.urlopen(f"{base}/panel?tickers=AAA,BBB") as response:
+            assert len(json.load(response)) == 3
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{base}/get?ticker=ZZZ")
+        assert error.value.code == 404
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{base}/get?ticker=..%2F..%2Fx")
+        assert error.value.code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,118 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from resample import resample_bars, resample_directory
+import store
+
+
+def make_daily(start, days, base=100.0):
+    dates = pd.bdate_range(start, periods=days)
+    closes = [base + i for i in range(days)]
+    return pd.DataFrame(
+        {
+            "Date": dates,
+            "Open": [c - 0.5 for c in closes],
+            "High": [c + 1 for c in closes],
+            "Low": [c - 1 for c in closes],
+            "Close": closes,
+            "Adj_Close": closes,
+            "Volume": [1000] * days,
+        }
+    )
+
+
+@pytest.fixture
+def daily():
+    aaa = make_daily("2023-01-02", 10)
+    bbb = make_daily("2023-01-02", 10, base=50.0)
+    aaa.insert(0, "Ticker", "AAA")
+    bbb.insert(0, "Ticker", "BBB")
+    # Newest first, like the Yahoo history table
+    return pd.concat([aaa, bbb]).iloc[::-1].reset_index(drop=True)
+
+
+def test_weekly_bars_aggregate_ohlcv_per_ticker(daily):
+    weekly = resample_bars(daily, "1wk")
+
+    assert weekly["Ticker"].tolist() == ["AAA", "AAA", "BBB", "BBB"]
+    first = weekly.iloc[0]
+    assert first["Date"] == pd.Timestamp("2023-01-02")
+    assert first["Open"] == 99.5
+    assert first["High"] == 105.0
+    assert first["Low"] == 99.0
+    assert first["Close"] == 104.0
+    assert first["Volume"] == 5000
+    assert weekly.iloc[3]["Close"] == 59.0
+
+
+def test_n_day_bars_count_trading_days(daily):
+    bars = resample_bars(daily, "3d")
+    assert (bars["Ticker"] == "AAA").sum() == 4
+    assert bars.iloc[0]["Close"] == 102.0
+    assert bars.iloc[3]["Volume"] == 1000
+
+
+def test_dividend_rows_are_ignored(daily):
+    dividend = pd.DataFrame(
+        {"Ticker": ["AAA"], "Date": [pd.Timestamp("2022-12-30")], "Volume": [None]}
+    )
+    monthly = resample_bars(pd.concat([daily, dividend]), "1mo")
+    assert monthly.iloc[0]["Date"] == pd.Timestamp("2023-01-02")
+
+
+def test_unsupported_interval(daily):
+    with pytest.raises(ValueError):
+        resample_bars(daily, "1h")
+
+
+def test_resample_directory_caches_per_interval(tmp_path):
+    make_daily("2023-01-02", 10).to_csv(
+        store.ticker_file_path(tmp_path, "AAA"), index=False
+    )
+
+    weekly = resample_directory(str(tmp_path), "1wk")
+    cached_path = store.ticker_file_path(tmp_path / "resampled" / "1wk", "AAA")
+    assert os.path.exists(cached_path)
+    assert len(weekly) == 2
+
+    mtime = os.path.getmtime(cached_path)
+    resample_directory(str(tmp_path), "1wk")
+    assert os.path.getmtime(cached_path) == mtime
+
+
+def test_resample_directory_tracks_deleted_and_empty_tickers(tmp_path):
+    daily_path = store.ticker_file_path(tmp_path, "AAA")
+    make_daily("2023-01-02", 10).to_csv(daily_path, index=False)
+    # Only dividend rows: no bars, but still cached
+    pd.DataFrame({"Date": ["2023-01-03"], "Open": [None]}).to_csv(
+        store.ticker_file_path(tmp_path, "DIV"), index=False
+    )
+
+    weekly = resample_directory(str(tmp_path), "1wk")
+    assert weekly["Ticker"].unique().tolist() == ["AAA"]
+    empty_cache = store.ticker_file_path(tmp_path / "resampled" / "1wk", "DIV")
+    mtime = os.path.getmtime(empty_cache)
+    resample_directory(str(tmp_path), "1wk")
+    assert os.path.getmtime(empty_cache) == mtime
+
+    os.remove(daily_path)
+    assert resample_directory(str(tmp_path), "1wk").empty
+    assert not os.path.exists(store.ticker_file_path(tmp_path / "resampled" / "1wk", "AAA"))
+
+
+@pytest.mark.parametrize("interval", ["1mo", "5d"])
+def test_resample_directory_with_header_only_file(tmp_path, interval):
+    # A failed scrape leaves a ticker file with only the header row
+    store.write_ticker_frame(
+        make_daily("2023-01-02", 1).iloc[:0], store.ticker_file_path(tmp_path, "EMPTY")
+    )
+
+    assert resample_directory(str(tmp_path), interval).empty
+    assert os.path.exists(
+        store.ticker_file_path(tmp_path / "resampled" / interval, "EMPTY")
+    )
@@ -0,0 +1,181 @@
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sinks import NdjsonSink, ArrowSink, STREAM_COLUMNS, open_sink
+from scraper import main as scraper_main, scrape_yahoo_finance_history
+
+
+@pytest.fixture
+def cleaned_df():
+    return pd.DataFrame(
+        {
+            "Date": pd.to_datetime(["2023-01-03", "2023-01-04"]),
+            "Open": [130.28, 126.89],
+            "High": [130.90, 128.66],
+            "Low": [124.17, 125.08],
+            "Close": [125.07, 126.36],
+            "Volume": [112117500, 89113600],
+        }
+    )
+
+
+def test_ndjson_sink_writes_one_record_per_row(cleaned_df):
+    stream = io.BytesIO()
+    sink = NdjsonSink(stream)
+    sink.write("AAPL", cleaned_df)
+    sink.write("MSFT", cleaned_df.iloc[:1])
+
+    lines = stream.getvalue().decode("utf-8").splitlines()
+    assert len(lines) == 3
+    records = [json.loads(line) for line in lines]
+    assert [r["Ticker"] for r in records] == ["AAPL", "AAPL", "MSFT"]
+    # Missing columns are filled so every record has the same keys
+    assert list(records[0].keys()) == STREAM_COLUMNS
+    assert records[0]["Adj_Close"] is None
+    assert records[0]["Date"].startswith("2023-01-03")
+    assert records[1]["Volume"] == 89113600
+
+
+def test_arrow_sink_streams_record_batch_per_ticker(cleaned_df):
+    pa = pytest.importorskip("pyarrow")
+    stream = io.BytesIO()
+    sink = ArrowSink(stream)
+    sink.write("AAPL", cleaned_df)
+    sink.write("MSFT", cleaned_df)
+    sink.close()
+
+    reader = pa.ipc.open_stream(stream.getvalue())
+    batches = list(reader)
+    assert len(batches) == 2
+    assert reader.schema.names == STREAM_COLUMNS
+    table = pa.Table.from_batches(batches).to_pandas()
+    assert table["Ticker"].tolist() == ["AAPL", "AAPL", "MSFT", "MSFT"]
+    assert table["Close"].iloc[1] == 126.36
+
+
+def test_open_sink_tcp_target(cleaned_df):
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    port = server.getsockname()[1]
+    received = []
+
+    def accept():
+        conn, _ = server.accept()
+        with conn:
+            received.append(conn.makefile("rb").read())
+
+    thread = threading.Thread(target=accept)
+    thread.start()
+    sink = open_sink("ndjson", f"tcp://127.0.0.1:{port}")
+    sink.write("AAPL", cleaned_df)
+    sink.close()
+    thread.join(timeout=5)
+    server.close()
+
+    assert len(received[0].splitlines()) == 2
+
+
+def test_open_sink_rejects_unknown_type():
+    with pytest.raises(ValueError):
+        open_sink("parquet")
+
+
+@patch("scraper.scrape_yahoo_finance_history")
+@patch("scraper.os.chdir")
+def test_main_streams_to_sink_without_output_dir(mock_chdir, mock_scrape_func, tmp_path):
+    target = tmp_path / "out.ndjson"
+    cli_args = ["scraper.py", "--tickers", "AAA", "--sink", "ndjson", "--sink-target", str(target)]
+
+    def fake_scrape(ticker, sink=None):
+        df = pd.DataFrame({"Date": ["2023-01-03"], "Close": [1.0]})
+        sink.write(ticker, df)
+        return df
+
+    mock_scrape_func.side_effect = fake_scrape
+    with patch.object(sys, "argv", cli_args):
+        scraper_main()
+
+    mock_chdir.assert_not_called()
+    records = [json.loads(line) for line in target.read_text().splitlines()]
+    assert records[0]["Ticker"] == "AAA"
+
+
+class BrokenSink:
+    def __init__(self):
+        self.writes = []
+        self.closed = False
+
+    def write(self, ticker_symbol, df):
+        self.writes.append(ticker_symbol)
+        raise BrokenPipeError("consumer went away")
+
+    def close(self):
+        self.closed = True
+
+
+@patch("scraper.fetch_yahoo_finance_history")
+def test_sink_errors_are_not_retried_as_extraction_failures(mock_fetch, cleaned_df):
+    mock_fetch.return_value = cleaned_df
+    sink = BrokenSink()
+
+    with pytest.raises(BrokenPipeError):
+        scrape_yahoo_finance_history("AAA", sink=sink)
+    mock_fetch.assert_called_once()
+    assert sink.writes == ["AAA"]
+
+
+@patch("scraper.fetch_yahoo_finance_history")
+@patch("scraper.sinks.open_sink")
+def test_main_aborts_when_sink_breaks(mock_open_sink, mock_fetch, cleaned_df):
+    mock_fetch.return_value = cleaned_df
+    sink = BrokenSink()
+    mock_open_sink.return_value = sink
+    cli_args = ["scraper.py", "--tickers", "AAA", "BBB", "--sink", "ndjson"]
+
+    with patch.object(sys, "argv", cli_args), patch("scraper.time.sleep"):
+        with pytest.raises(BrokenPipeError):
+            scraper_main()
+
+    # No further tickers are scraped into the dead sink
+    assert [c.args[0] for c in mock_fetch.call_args_list] == ["AAA"]
+    assert sink.closed
+
+
+def test_ndjson_to_stdout_is_not_mixed_with_log_output(tmp_path):
+    # Fresh interpreter so import-time output of scraper.py is captured too
+    repo_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    driver = (
+        "import sys\n"
+        f"sys.path.insert(0, {repo_dir!r})\n"
+        "from unittest.mock import patch\n"
+        "import pandas as pd\n"
+        "import scraper\n"
+        "def fake_scrape(ticker, sink=None):\n"
+        "    print(f'Scraping {ticker}...')\n"
+        "    df = pd.DataFrame({'Date': ['2023-01-03'], 'Close': [1.0]})\n"
+        "    sink.write(ticker, df)\n"
+        "    return df\n"
+        "sys.argv = ['scraper.py', '--tickers', 'AAA', 'BBB', '--sink', 'ndjson', '--sink-target', '-']\n"
+        "with patch('scraper.scrape_yahoo_finance_history', side_effect=fake_scrape), patch('scraper.time.sleep'):\n"
+        "    scraper.main()\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", driver], cwd=tmp_path, capture_output=True, check=True
+    )
+
+    lines = result.stdout.decode("utf-8").splitlines()
+    assert len(lines) == 2
+    assert [json.loads(line)["Ticker"] for line in lines] == ["AAA", "BBB"]
+    assert b"YAHOO_EMAIL" in result.stderr
@@ -0,0 +1,123 @@
+import os
+import stat
+import sys
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import store
+
+
+def make_rows(dates, close):
+    return pd.DataFrame(
+        {"Date": pd.to_datetime(dates), "Close": close, "Volume": [100] * len(dates)}
+    )
+
+
+def test_merge_frames_last_write_wins():
+    existing = make_rows(["2023-01-04", "2023-01-03", "2023-01-05"], [2.0, 1.0, 3.0])
+    new = make_rows(["2023-01-05", "2023-01-06"], [30.0, 4.0])
+
+    merged = store.merge_frames(existing, new)
+
+    assert merged["Date"].dt.day.tolist() == [3, 4, 5, 6]
+    assert merged["Close"].tolist() == [1.0, 2.0, 30.0, 4.0]
+
+
+def test_merge_frames_keeps_dividend_rows_of_a_refetched_day():
+    existing = make_rows(["2023-01-05"], [3.0])
+    dividend = pd.DataFrame(
+        {"Date": pd.to_datetime(["2023-01-05"]), "Close": [None], "Volume": [None]}
+    )
+    new = pd.concat([make_rows(["2023-01-05"], [30.0]), dividend], ignore_index=True)
+
+    merged = store.merge_frames(existing, new)
+    assert len(merged) == 2
+    assert merged["Close"].iloc[0] == 30.0
+
+
+def test_write_ticker_frame_merges_and_replaces_atomically(tmp_path):
+    path = store.ticker_file_path(tmp_path, "AAA")
+    store.write_ticker_frame(make_rows(["2023-01-04", "2023-01-03"], [2.0, 1.0]), path)
+    store.write_ticker_frame(make_rows(["2023-01-04", "2023-01-05"], [20.0, 3.0]), path)
+
+    stored = store.read_ticker_frame(path)
+    assert stored["Close"].tolist() == [1.0, 20.0, 3.0]
+    # Only the data file and its lock file remain, no staged temp files
+    assert sorted(os.listdir(tmp_path)) == [
+        "AAA_historical_data_1y.csv",
+        "AAA_historical_data_1y.csv.lock",
+    ]
+
+
+def test_failed_write_leaves_existing_file_intact(tmp_path):
+    path = store.ticker_file_path(tmp_path, "AAA")
+    store.write_ticker_frame(make_rows(["2023-01-03"], [1.0]), path)
+
+    with patch("store.os.replace", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            store.write_ticker_frame(make_rows(["2023-01-04"], [2.0]), path)
+
+    assert store.read_ticker_frame(path)["Close"].tolist() == [1.0]
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_compact_merges_window_fragments(tmp_path):
+    canonical = store.ticker_file_path(tmp_path, "AAA")
+    duplicated = make_rows(["2023-01-05", "2023-01-03", "2023-01-03"], [3.0, 1.0, 1.0])
+    duplicated.to_csv(canonical, index=False)
+    fragment = store.ticker_file_path(tmp_path, "AAA", "20230104-20230105")
+    make_rows(["2023-01-04", "2023-01-05"], [2.0, 30.0]).to_csv(fragment, index=False)
+    other_period = store.ticker_file_path(tmp_path, "BBB", "5y")
+    make_rows(["2023-01-03"], [1.0]).to_csv(other_period, index=False)
+
+    compacted = store.compact(str(tmp_path))
+
+    assert compacted == {"AAA": 3}
+    assert not os.path.exists(fragment)
+    assert os.path.exists(other_period)
+    stored = store.read_ticker_frame(canonical)
+    assert stored["Close"].tolist() == [1.0, 2.0, 30.0]
+
+
+def test_compact_orders_period_file_and_fragments_by_mtime(tmp_path):
+    canonical = store.ticker_file_path(tmp_path, "AAA")
+    fragment = store.ticker_file_path(tmp_path, "AAA", "20230104-20230105")
+    make_rows(["2023-01-04", "2023-01-05"], [1.0, 1.0]).to_csv(fragment, index=False)
+    make_rows(["2023-01-04", "2023-01-05"], [2.0, 2.0]).to_csv(canonical, index=False)
+    # The fragment was fetched an hour before the period file was written
+    hour_ago = os.path.getmtime(canonical) - 3600
+    os.utime(fragment, (hour_ago, hour_ago))
+
+    store.compact(str(tmp_path))
+
+    assert store.read_ticker_frame(canonical)["Close"].tolist() == [2.0, 2.0]
+    assert not os.path.exists(fragment)
+
+
+def test_compact_sorts_and_dedupes_fragment_only_ticker(tmp_path):
+    fragment = store.ticker_file_path(tmp_path, "AAA", "20230103-20230104")
+    make_rows(["2023-01-04", "2023-01-03", "2023-01-03"], [2.0, 1.0, 1.0]).to_csv(
+        fragment, index=False
+    )
+
+    assert store.compact(str(tmp_path)) == {"AAA": 2}
+    stored = store.read_ticker_frame(store.ticker_file_path(tmp_path, "AAA"))
+    assert stored["Close"].tolist() == [1.0, 2.0]
+
+
+def test_atomic_write_keeps_normal_file_permissions(tmp_path):
+    path = store.ticker_file_path(tmp_path, "AAA")
+    old_umask = os.umask(0o022)
+    try:
+        store.write_ticker_frame(make_rows(["2023-01-03"], [1.0]), path)
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+
+        os.chmod(path, 0o640)
+        store.write_ticker_frame(make_rows(["2023-01-04"], [2.0]), path)
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+    finally:
+        os.umask(old_umask)